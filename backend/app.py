@@ -1,112 +1,99 @@
-from flask import Flask, jsonify, request
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
-from flask_cors import CORS
+from flask import Flask
 from dotenv import load_dotenv
+from utils import metrics
+from utils.compression import compress_response
+from utils.json_provider import configure_json
 import os
 
-load_dotenv()
+# 'full' serves everything; 'verify' serves only the public verify and
+# download routes, for horizontally scaled verification instances
+PROFILES = ('full', 'verify')
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///psu_certificates.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
+def create_app(profile=None):
+    """Build and configure the Flask application.
 
-# Initialize db from models
-from models import db
-db.init_app(app)
+    Importing this module does nothing; building the app reads env and
+    registers blueprints but opens no database connection and runs no DDL.
+    Schema and default data are set up explicitly with `python init_db.py`
+    (or `flask init-db`) and migrations with `flask db upgrade`.
 
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-CORS(app, 
-     origins=['*'],
-     methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-     allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
-     supports_credentials=False)
+    profile (default: APP_PROFILE env, else 'full') selects the routes. A
+    verify-only app never imports the PDF/QR stack or reads the private
+    key, and uses a small, read-only connection pool.
+    """
+    load_dotenv()
+    profile = profile or os.getenv('APP_PROFILE', 'full')
+    if profile not in PROFILES:
+        raise ValueError(f"APP_PROFILE must be one of: {', '.join(PROFILES)}")
 
-from routes import auth, certificates
+    app = Flask(__name__)
+    app.config['APP_PROFILE'] = profile
+    configure_json(app)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
 
-app.register_blueprint(auth.bp)
-app.register_blueprint(certificates.bp)
+    # Initialize db from models; pool sizing and the read replica come from env
+    from models import db
+    from utils.db_pool import configure_database
+    configure_database(app, read_only=profile == 'verify')
+    db.init_app(app)
 
-@app.route('/')
-def health_check():
-    return jsonify({
-        'status': 'healthy',
-        'message': 'PSU Certificate Verification API',
-        'version': '1.0.0'
-    })
+    # Flask-Migrate pulls in Alembic (about half of the import time), and
+    # only the `flask db` commands use it
+    if os.getenv('FLASK_RUN_FROM_CLI') == 'true':
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
-@app.route('/health')
-def health():
-    return jsonify({'status': 'ok'})
+    from flask_jwt_extended import JWTManager
+    from flask_cors import CORS
+    JWTManager(app)
+    CORS(app,
+         origins=['*'],
+         methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
+         allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
+         supports_credentials=False)
+
+    metrics.instrument_sqlalchemy()
+
+    from routes import certificates, system
+    app.register_blueprint(system.bp)
+    if profile == 'verify':
+        app.register_blueprint(certificates.verify_bp)
+    else:
+        from routes import auth
+        app.register_blueprint(auth.bp)
+        app.register_blueprint(certificates.bp)
+
+    app.before_request(before_request)
+    app.after_request(after_request)
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables, the default admin and the issuer key registration"""
+        from init_db import init_database
+        init_database(app)
+
+    return app
+
+def before_request():
+    metrics.start_request()
 
-@app.after_request
 def after_request(response):
+    compress_response(response)
+    metrics.finish_request(response)
     response.headers['Access-Control-Allow-Origin'] = '*'
     response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization,X-Requested-With'
     response.headers['Access-Control-Allow-Methods'] = 'GET,PUT,POST,DELETE,OPTIONS'
     response.headers['Access-Control-Allow-Credentials'] = 'false'
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    # Routes that opt into shared caching (public) keep their own policy
+    if not response.cache_control.public:
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     return response
 
-@app.route('/test-login', methods=['GET', 'POST', 'OPTIONS'])
-def test_login():
-    if request.method == 'OPTIONS':
-        return '', 200
-    
-    return jsonify({
-        'status': 'success',
-        'message': f'Login endpoint is working - Method: {request.method}',
-        'data': request.get_json() if request.get_json() else 'No data received'
-    })
-
-@app.route('/init-db')
-def init_database():
-    """Initialize database and create admin user"""
-    try:
-        # Create tables
-        db.create_all()
-        
-        # Import here to avoid circular import
-        from models import Admin
-        admin = Admin.query.filter_by(username='admin').first()
-        if not admin:
-            admin = Admin(username='admin')
-            admin.set_password('admin123')
-            db.session.add(admin)
-            db.session.commit()
-            return jsonify({
-                'status': 'success',
-                'message': 'Database initialized and admin user created',
-                'admin': {'username': 'admin', 'password': 'admin123'}
-            })
-        else:
-            return jsonify({
-                'status': 'success',
-                'message': 'Database already initialized',
-                'admin': {'username': 'admin', 'password': 'admin123'}
-            })
-    except Exception as e:
-        return jsonify({
-            'status': 'error',
-            'message': str(e)
-        }), 500
-
-# Initialize database on startup
-with app.app_context():
-    try:
-        db.create_all()
-        from models import Admin
-        if not Admin.query.filter_by(username='admin').first():
-            admin = Admin(username='admin')
-            admin.set_password('admin123')
-            db.session.add(admin)
-            db.session.commit()
-            print("Admin user created")
-    except Exception as e:
-        print(f"Database initialization error: {e}")
-
 if __name__ == '__main__':
+    # Development server only; production runs gunicorn -c gunicorn.conf.py "app:create_app()"
+    from init_db import init_database
+    app = create_app()
+    init_database(app)
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(debug=False, host='0.0.0.0', port=port)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compare verify throughput of running servers under many concurrent connections.
+
+Uses an asyncio HTTP/1.1 keep-alive client, so it can hold hundreds of
+connections open, which the thread-based load_test_verify.py cannot.
+Point it at the Flask app (gunicorn) and at verify_service.py (uvicorn):
+
+    gunicorn -c gunicorn.conf.py "app:create_app()" &
+    uvicorn verify_service:app --port 8001 &
+    python benchmarks/bench_async_verify.py --uuid <uuid> -c 500 \\
+        --url http://localhost:5000 --url http://localhost:8001
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid as uuid_lib
+from urllib.parse import urlsplit
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', action='append', required=True, help='server base URL (repeatable)')
+    parser.add_argument('--uuid', action='append', default=[], help='certificate UUID (repeatable)')
+    parser.add_argument('-c', '--concurrency', type=int, default=200)
+    parser.add_argument('-d', '--duration', type=float, default=10.0)
+    return parser.parse_args()
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return status
+
+async def client(target, uuids, deadline, latencies, errors):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(target.hostname, target.port or 80)
+            path = f"/api/certificates/{random.choice(uuids)}/verify"
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {target.netloc}\r\n\r\n".encode('ascii'))
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 500:
+                errors.append(status)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors.append(0)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+async def run(url, uuids, concurrency, duration):
+    target = urlsplit(url)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(target, uuids, deadline, latencies, errors) for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+def main():
+    args = parse_args()
+    uuids = args.uuid or [str(uuid_lib.uuid4())]
+    for url in args.url:
+        latencies, errors, elapsed = asyncio.run(run(url, uuids, args.concurrency, args.duration))
+        latencies.sort()
+        print(f"{url:<28} {len(latencies) / elapsed:8.0f} req/s  "
+              f"p50 {percentile(latencies, 0.50) * 1000:7.1f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  "
+              f"errors {len(errors)}  ({args.concurrency} connections)")
+
+if __name__ == '__main__':
+    main()
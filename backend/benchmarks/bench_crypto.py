@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for certificate signature verification.
+
+Compares the old path (read + parse the PEM file on every call) with the
+cached KeyManager path, and with the raw verify for the active key's
+algorithm (Ed25519, ECDSA P-256 or RSA-PSS) as a floor.
+
+Run from the backend directory after generate_keys.py:
+    python benchmarks/bench_crypto.py
+"""
+
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.crypto import (
+    create_canonical_payload, key_algorithm, load_public_key,
+    sign_certificate, verify_bytes, verify_certificate
+)
+
+PAYLOAD = {
+    'uuid': '00000000-0000-4000-8000-000000000000',
+    'student_name': 'Benchmark Student',
+    'student_id': 'PSU-BENCH-0001',
+    'degree': 'Bachelor of Science',
+    'program': 'Computer Science',
+    'issue_date': '2024-06-01',
+    'issuer': 'Puntland State University'
+}
+
+def timed(label, fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / iterations * 1e6:10.1f} us/op  {iterations / elapsed:10.0f} ops/s")
+
+def uncached_verify(payload, signature_b64):
+    public_key = load_public_key()
+    verify_bytes(public_key, base64.b64decode(signature_b64), create_canonical_payload(payload))
+    return True
+
+def main(iterations=2000):
+    signature = sign_certificate(PAYLOAD)
+    public_key = load_public_key()
+    canonical = create_canonical_payload(PAYLOAD)
+    raw = base64.b64decode(signature)
+    algorithm = key_algorithm(public_key)
+
+    timed('verify (reload PEM)', lambda: uncached_verify(PAYLOAD, signature), iterations)
+    timed('verify (KeyManager)', lambda: verify_certificate(PAYLOAD, signature), iterations)
+    timed(f'raw {algorithm} verify', lambda: verify_bytes(public_key, raw, canonical, algorithm), iterations)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Serialization time and bytes on the wire for a large certificate listing.
+
+Builds a listing of --rows certificates shaped like GET /api/certificates
+(dates as date/datetime objects) and reports, per JSON provider, the time
+to build the rows and to serialize the response, then the size and time
+of each response encoding (identity, gzip, and br/zstd when brotli and
+zstandard are installed).
+"stdlib-isoformat" is the old route code: .isoformat() per row and
+Flask's sorted-key stdlib encoder.
+
+    python benchmarks/bench_json_listing.py --rows 50000 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+def build_listing(rows, isoformat=False):
+    created = datetime(2024, 6, 1, 9, 30, 0, 123456)
+    result = []
+    for i in range(rows):
+        issue_date = date(2024, 6, 1) - timedelta(days=i % 365)
+        created_at = created - timedelta(seconds=i * 7)
+        result.append({
+            'id': rows - i,
+            'uuid': f'{i:08x}-1b2c-4d3e-8f40-{i * 7919:012x}'[-36:],
+            'student_name': f'Student{i} Graduate',
+            'student_id': f'PSU-{i:07d}',
+            'degree': 'Bachelor of Science',
+            'program': ('Computer Science', 'Civil Engineering', 'Nursing')[i % 3],
+            'issue_date': issue_date.isoformat() if isoformat else issue_date,
+            'revoked': i % 97 == 0,
+            'created_at': created_at.isoformat() if isoformat else created_at
+        })
+    return {'certificates': result, 'next_cursor': None}
+
+def median_seconds(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+def main():
+    args = parse_args()
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+    from flask.json.provider import DefaultJSONProvider
+    from app import create_app
+    from utils.compression import compressors
+    from utils.json_provider import IsoJSONProvider, OrjsonProvider
+
+    app = create_app()
+    providers = [
+        ('stdlib-isoformat', DefaultJSONProvider(app), True),
+        ('stdlib', IsoJSONProvider(app), False),
+        ('orjson', OrjsonProvider(app), False),
+    ]
+
+    print(f"{args.rows} certificates, median of {args.repeat}")
+    body = None
+    for name, provider, isoformat in providers:
+        build, listing = median_seconds(lambda: build_listing(args.rows, isoformat), args.repeat)
+        with app.app_context():
+            serialize, response = median_seconds(lambda: provider.response(listing), args.repeat)
+        body = response.get_data()
+        print(f"  {name:<18} build {build * 1000:7.1f} ms  serialize {serialize * 1000:7.1f} ms  "
+              f"{len(body) / 1024:9.1f} KiB")
+
+    # Compression of the orjson body with the configured levels
+    print(f"  {'identity':<18} {len(body) / 1024:9.1f} KiB")
+    for encoding, compress in compressors().items():
+        elapsed, data = median_seconds(lambda: compress(body), args.repeat)
+        print(f"  {encoding:<18} {len(data) / 1024:9.1f} KiB  ({len(data) / len(body):6.1%})  "
+              f"{elapsed * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Compare per-certificate signing with Merkle-batched cohort signing.
+
+Signs a cohort of payloads one by one and as a single Merkle root, then
+verifies every certificate both ways (the Merkle path checks the root
+signature once and hashes the rest).
+
+Run from the backend directory after generate_keys.py:
+    python benchmarks/bench_merkle.py [cohort_size]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.crypto import sign_payload, sign_payloads_merkle, verify_certificate
+
+def payloads(count):
+    return [{
+        'uuid': f'00000000-0000-4000-8000-{i:012d}',
+        'student_name': f'Benchmark Student {i}',
+        'student_id': f'PSU-BENCH-{i:06d}',
+        'degree': 'Bachelor of Science',
+        'program': 'Computer Science',
+        'issue_date': '2024-06-01',
+        'issuer': 'Puntland State University'
+    } for i in range(count)]
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {count / elapsed:10.0f} certificates/s  {elapsed * 1000:8.1f} ms total")
+    return result
+
+def main(cohort_size=1000):
+    cohort = payloads(cohort_size)
+
+    individual = timed('sign individually', lambda: [sign_payload(p) for p in cohort], cohort_size)
+    batched = timed('sign Merkle cohort', lambda: sign_payloads_merkle(cohort), cohort_size)
+
+    timed('verify individually', lambda: all(
+        verify_certificate(p, s['signature'], s['key_id'], s['algorithm'])
+        for p, s in zip(cohort, individual)), cohort_size)
+    timed('verify Merkle proofs', lambda: all(
+        verify_certificate(p, s['signature'], s['key_id'], s['algorithm'], s['merkle_proof'])
+        for p, s in zip(cohort, batched)), cohort_size)
+
+    proof_chars = sum(len(s['merkle_proof']) for s in batched) / cohort_size
+    print(f"average stored proof: {proof_chars:.0f} chars")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare the legacy two-query certificate lookup with the joined loader.
+
+Seeds a database, then times the old Certificate + Student.query.get()
+pattern against routes.certificates.load_certificate_row() and counts the
+statements each one sends. --rtt-ms adds an artificial delay per statement
+to stand in for a remote Postgres (default 0.5, a same-region network
+round trip); --database-url points at a real one.
+
+With --rtt-ms 0 on a local SQLite file the joined load is the slower one
+(about 530 vs 410 us/lookup): building the two-entity ORM row costs more
+than a second in-process statement. It pays off once each statement
+crosses a network, from roughly 0.1 ms of round-trip time.
+
+    python benchmarks/bench_queries.py --rows 2000 --rtt-ms 2
+    python benchmarks/bench_queries.py --database-url postgresql://... --rtt-ms 0
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--rtt-ms', type=float, default=0.5,
+                        help='simulated round trip per statement (0 with a real --database-url)')
+    return parser.parse_args()
+
+def seed(db, Student, Certificate, rows):
+    if Certificate.query.count() >= rows:
+        return
+    for i in range(rows):
+        student = Student(first_name='Bench', last_name=f'Student{i}', student_id=f'BENCH-{i:06d}')
+        db.session.add(student)
+        db.session.flush()
+        db.session.add(Certificate(
+            student_id=student.id,
+            degree='Bachelor of Science',
+            program='Computer Science',
+            issue_date=date(2024, 6, 1),
+            signature='x' * 344,
+            pdf_path=f'certificates/certificate_{i}.pdf'
+        ))
+    db.session.commit()
+
+def main():
+    args = parse_args()
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    from sqlalchemy import event
+    from app import create_app
+    from models import db, Certificate, Student
+    from routes.certificates import load_certificate_row, VERIFY_COLUMNS
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(db, Student, Certificate, args.rows)
+        uuids = [u for (u,) in db.session.query(Certificate.uuid).all()]
+        sample = [random.choice(uuids) for _ in range(args.lookups)]
+
+        counter = {'statements': 0}
+
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            counter['statements'] += 1
+            if args.rtt_ms:
+                time.sleep(args.rtt_ms / 1000.0)
+
+        def legacy(uuid):
+            certificate = Certificate.query.filter_by(uuid=uuid).first()
+            student = db.session.get(Student, certificate.student_id)
+            return certificate.signature, student.student_id
+
+        def joined(uuid):
+            certificate, student = load_certificate_row(uuid, VERIFY_COLUMNS)
+            return certificate.signature, student.student_id
+
+        for label, lookup in (('two queries', legacy), ('joined load', joined)):
+            counter['statements'] = 0
+            start = time.perf_counter()
+            for uuid in sample:
+                lookup(uuid)
+                db.session.expunge_all()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<12} {elapsed / len(sample) * 1e6:9.1f} us/lookup  "
+                  f"{counter['statements'] / len(sample):.2f} statements/lookup")
+
+if __name__ == '__main__':
+    main()
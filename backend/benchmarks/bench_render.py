@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark the certificate render step (QR code + PDF).
+
+Reports per-certificate latency, PDFs per second, PDF size and peak RSS.
+Rendering happens entirely in memory; nothing is written to disk.
+
+Run from the backend directory:
+    python benchmarks/bench_render.py 200
+"""
+
+import os
+import resource
+import sys
+import time
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.issuance import verification_url
+from utils.pdf_generator import generate_certificate_pdf
+from utils.qr_generator import generate_qr_code
+
+def make_certificate():
+    certificate = SimpleNamespace(
+        uuid=str(uuid.uuid4()),
+        degree='Bachelor of Science',
+        program='Computer Science',
+        issue_date=date(2024, 6, 1)
+    )
+    student = SimpleNamespace(first_name='Benchmark', last_name='Student', student_id='PSU-BENCH-0001')
+    return certificate, student
+
+def render(certificate, student):
+    qr_code = generate_qr_code(verification_url(certificate.uuid))
+    return generate_certificate_pdf(certificate, student, qr_code)
+
+def main(iterations=200):
+    jobs = [make_certificate() for _ in range(iterations)]
+    render(*make_certificate())
+
+    qr_start = time.perf_counter()
+    for certificate, _ in jobs:
+        generate_qr_code(verification_url(certificate.uuid))
+    qr_elapsed = time.perf_counter() - qr_start
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for certificate, student in jobs:
+        total_bytes += len(render(certificate, student))
+    elapsed = time.perf_counter() - start
+
+    print(f"QR code only   {qr_elapsed / iterations * 1e3:8.2f} ms/certificate")
+    print(f"QR + PDF       {elapsed / iterations * 1e3:8.2f} ms/certificate  {iterations / elapsed:8.1f} PDFs/s")
+    print(f"PDF size       {total_bytes / iterations / 1024:8.1f} KB")
+    # ru_maxrss is in kilobytes on Linux
+    print(f"peak RSS       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:8.1f} MB")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Compare the supported signature algorithms.
+
+Reports sign and verify throughput and the stored (base64) signature size
+for Ed25519, ECDSA P-256 and RSA-2048 PSS over a certificate payload.
+
+    python benchmarks/bench_signers.py [iterations]
+"""
+
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from utils.crypto import create_canonical_payload, key_algorithm, sign_bytes, verify_bytes
+
+PAYLOAD = {
+    'uuid': '00000000-0000-4000-8000-000000000000',
+    'student_name': 'Benchmark Student',
+    'student_id': 'PSU-BENCH-0001',
+    'degree': 'Bachelor of Science',
+    'program': 'Computer Science',
+    'issue_date': '2024-06-01',
+    'issuer': 'Puntland State University'
+}
+
+KEYS = (
+    lambda: ed25519.Ed25519PrivateKey.generate(),
+    lambda: ec.generate_private_key(ec.SECP256R1()),
+    lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+)
+
+def ops_per_second(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+def main(iterations=2000):
+    data = create_canonical_payload(PAYLOAD)
+    print(f"{'algorithm':<20} {'sign/s':>10} {'verify/s':>10} {'sig bytes':>10} {'stored chars':>13}")
+    for make_key in KEYS:
+        private_key = make_key()
+        public_key = private_key.public_key()
+        signature = sign_bytes(private_key, data)
+
+        sign_rate = ops_per_second(lambda: sign_bytes(private_key, data), iterations)
+        verify_rate = ops_per_second(lambda: verify_bytes(public_key, signature, data), iterations)
+        print(f"{key_algorithm(private_key):<20} {sign_rate:10.0f} {verify_rate:10.0f} "
+              f"{len(signature):10d} {len(base64.b64encode(signature)):13d}")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Measure worker cold start: import, create_app() and the first verify.
+
+Each sample runs in a fresh interpreter, so nothing is warm except the OS
+file cache. Reports the median time to import app, to build the app, and
+to answer the first GET /api/certificates/<uuid>/verify, the peak RSS,
+and which heavy modules (Alembic, ReportLab, qrcode, PIL) got imported,
+for each app profile (APP_PROFILE=full / verify).
+
+    python benchmarks/bench_startup.py --runs 10 --profile full verify
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('alembic', 'flask_migrate', 'reportlab', 'qrcode', 'PIL')
+
+SETUP = '''
+from app import create_app
+from models import db
+with create_app().app_context():
+    db.create_all()
+'''
+
+PROBE = '''
+import json, resource, sys, time
+start = time.perf_counter()
+import app as appmod
+imported = time.perf_counter()
+app = appmod.create_app()
+created = time.perf_counter()
+response = app.test_client().get('/api/certificates/00000000-0000-4000-8000-000000000000/verify')
+verified = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'first_verify': verified - created,
+    'status': response.status_code,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': [m for m in %r if m in sys.modules]
+}))
+''' % (HEAVY_MODULES,)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--profile', nargs='+', default=['full', 'verify'], choices=('full', 'verify'))
+    parser.add_argument('--database-url', default=None, help='default: a fresh SQLite file')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'startup.db')
+    env = dict(os.environ, DATABASE_URL=database_url)
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    # Schema setup is not part of startup; do it once up front
+    subprocess.check_call([sys.executable, '-c', SETUP], cwd=BACKEND_DIR, env=env)
+
+    for profile in args.profile:
+        samples = []
+        for _ in range(args.runs):
+            output = subprocess.check_output([sys.executable, '-c', PROBE], cwd=BACKEND_DIR,
+                                             env=dict(env, APP_PROFILE=profile), text=True)
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+
+        print(f"APP_PROFILE={profile}")
+        for phase in ('import', 'create_app', 'first_verify'):
+            values = [s[phase] for s in samples]
+            print(f"  {phase:<14} median {statistics.median(values) * 1000:8.1f} ms  "
+                  f"min {min(values) * 1000:8.1f} ms")
+        total = [s['import'] + s['create_app'] + s['first_verify'] for s in samples]
+        print(f"  {'total':<14} median {statistics.median(total) * 1000:8.1f} ms")
+        print(f"  peak RSS       median {statistics.median(s['rss_mb'] for s in samples):8.1f} MB")
+        print(f"  first verify status {samples[-1]['status']}; "
+              f"heavy modules loaded: {', '.join(samples[-1]['modules']) or 'none'}")
+
+if __name__ == '__main__':
+    main()
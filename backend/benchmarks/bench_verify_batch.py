@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compare one-by-one verification with the batch verify endpoint.
+
+Seeds a database with signed certificates, then verifies the same UUIDs
+through GET /api/certificates/<uuid>/verify and through
+POST /api/certificates/verify-batch, clearing the verdict cache before
+each run so every signature is actually checked.
+
+    python benchmarks/bench_verify_batch.py --rows 1000 --batch-size 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    return parser.parse_args()
+
+def seed(db, Student, Certificate, rows):
+    from utils.crypto import build_certificate_payload, sign_certificate
+
+    if Certificate.query.count() >= rows:
+        return
+    for i in range(rows):
+        student = Student(first_name='Bench', last_name=f'Student{i}', student_id=f'BENCH-{i:06d}')
+        db.session.add(student)
+        db.session.flush()
+        certificate = Certificate(
+            student_id=student.id,
+            degree='Bachelor of Science',
+            program='Computer Science',
+            issue_date=date(2024, 6, 1),
+            signature=''
+        )
+        db.session.add(certificate)
+        db.session.flush()
+        certificate.signature = sign_certificate(build_certificate_payload(certificate, student))
+    db.session.commit()
+
+def main():
+    args = parse_args()
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    from app import create_app
+    from models import db, Certificate, Student
+    from routes.certificates import verification_cache
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(db, Student, Certificate, args.rows)
+        uuids = [u for (u,) in db.session.query(Certificate.uuid).limit(args.rows).all()]
+
+    client = app.test_client()
+
+    def single():
+        for uuid in uuids:
+            assert client.get(f'/api/certificates/{uuid}/verify').status_code == 200
+
+    def batch():
+        for start in range(0, len(uuids), args.batch_size):
+            response = client.post('/api/certificates/verify-batch',
+                                   json={'uuids': uuids[start:start + args.batch_size]})
+            assert response.status_code == 200
+
+    for label, run in (('single endpoint', single), (f'batch of {args.batch_size}', batch)):
+        verification_cache.clear()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<16} {len(uuids) / elapsed:10.0f} verifications/s  "
+              f"{elapsed / len(uuids) * 1e6:9.1f} us/verification")
+
+if __name__ == '__main__':
+    main()
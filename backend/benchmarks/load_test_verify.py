@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Load test for the public verify endpoint of a running server.
+
+Opens --concurrency keep-alive connections and hammers
+GET /api/certificates/<uuid>/verify for --duration seconds, then reports
+requests/s and latency percentiles. Pass real UUIDs with --uuid to
+exercise the VALID path; without any, a random UUID tests NOT_FOUND.
+
+    gunicorn -c gunicorn.conf.py "app:create_app()" &
+    python benchmarks/load_test_verify.py --url http://localhost:5000 --uuid <uuid> -c 32
+"""
+
+import argparse
+import http.client
+import random
+import threading
+import time
+import uuid as uuid_lib
+from urllib.parse import urlsplit
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--uuid', action='append', default=[], help='certificate UUID (repeatable)')
+    parser.add_argument('-c', '--concurrency', type=int, default=16)
+    parser.add_argument('-d', '--duration', type=float, default=10.0)
+    return parser.parse_args()
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_client(target, uuids, deadline, latencies, errors):
+    connection_class = http.client.HTTPSConnection if target.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(target.netloc, timeout=30)
+    while time.perf_counter() < deadline:
+        path = f"{target.path.rstrip('/')}/api/certificates/{random.choice(uuids)}/verify"
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = connection_class(target.netloc, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status >= 500:
+            errors.append(response.status)
+    connection.close()
+
+def main():
+    args = parse_args()
+    target = urlsplit(args.url)
+    uuids = args.uuid or [str(uuid_lib.uuid4())]
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=run_client, args=(target, uuids, deadline, latencies, errors))
+               for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"requests     {len(latencies)} in {elapsed:.1f}s with {args.concurrency} connections")
+    print(f"throughput   {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency      p50 {percentile(latencies, 0.50) * 1000:.1f} ms  "
+          f"p90 {percentile(latencies, 0.90) * 1000:.1f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"errors       {len(errors)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Issue certificates in bulk from a CSV or JSON file of graduates"""
+
+from app import create_app
+from utils.issuance import SIGNING_MODES, issue_certificates_bulk, parse_graduates_csv
+import argparse
+import json
+import sys
+import time
+
+def load_records(path):
+    """Load graduate records from a .csv or .json file"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    if path.lower().endswith('.json'):
+        return json.loads(text)
+    return parse_graduates_csv(text)
+
+def int_at_least(minimum):
+    """argparse type for integers >= minimum"""
+    def parse(value):
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if number is None or number < minimum:
+            raise argparse.ArgumentTypeError(f'must be an integer of at least {minimum}')
+        return number
+    return parse
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path', help='CSV (with header row) or JSON array of graduates')
+    parser.add_argument('--chunk-size', type=int_at_least(1), default=None, help='rows per commit')
+    parser.add_argument('--workers', type=int_at_least(0), default=None, help='signing/rendering processes (0 = in-process)')
+    parser.add_argument('--signing', choices=SIGNING_MODES, default=None,
+                        help='merkle = one signature per chunk with per-certificate proofs')
+    parser.add_argument('--report', help='write the per-row result report to this JSON file')
+    args = parser.parse_args()
+
+    records = load_records(args.path)
+
+    app = create_app()
+    start = time.perf_counter()
+    with app.app_context():
+        results = issue_certificates_bulk(records, chunk_size=args.chunk_size, workers=args.workers,
+                                          signing=args.signing)
+    elapsed = time.perf_counter() - start
+
+    issued = sum(1 for r in results if r['status'] == 'issued')
+    for result in results:
+        if result['status'] == 'error':
+            print(f"Row {result['row']}: {result['error']}", file=sys.stderr)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    print(f"Issued {issued}/{len(records)} certificates in {elapsed:.1f}s "
+          f"({issued / elapsed if elapsed else 0:.1f} certificates/s)")
+    return 0 if issued == len(records) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
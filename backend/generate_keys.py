@@ -1,23 +1,41 @@
 #!/usr/bin/env python3
-"""Generate RSA key pair for certificate signing"""
+"""Generate a key pair for certificate signing.
+
+    python generate_keys.py                      # Ed25519 (default)
+    python generate_keys.py --algorithm ecdsa-p256
+    python generate_keys.py --rotate             # replace the active key
+
+Rotation archives the old key pair under keys/retired/<key_id>/, records
+the old key in the issuer registry together with every certificate it
+signed, and registers the new key as active. Old certificates keep
+verifying through the registry.
+"""
 
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+import argparse
 import os
+import sys
 
-def generate_key_pair():
-    """Generate RSA key pair and save to files"""
-    # Generate private key
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048
-    )
+KEY_DIR = 'keys'
+PRIVATE_KEY_PATH = os.path.join(KEY_DIR, 'private_key.pem')
+PUBLIC_KEY_PATH = os.path.join(KEY_DIR, 'public_key.pem')
+
+GENERATORS = {
+    'ed25519': lambda: ed25519.Ed25519PrivateKey.generate(),
+    'ecdsa-p256': lambda: ec.generate_private_key(ec.SECP256R1()),
+    'rsa': lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+}
+
+def generate_key_pair(algorithm='ed25519'):
+    """Generate a key pair and save it as the active key"""
+    private_key = GENERATORS[algorithm]()
     
     # Get public key
     public_key = private_key.public_key()
     
     # Ensure keys directory exists
-    os.makedirs('keys', exist_ok=True)
+    os.makedirs(KEY_DIR, exist_ok=True)
     
     # Serialize private key
     private_pem = private_key.private_bytes(
@@ -33,15 +51,61 @@ def generate_key_pair():
     )
     
     # Save keys to files
-    with open('keys/private_key.pem', 'wb') as f:
+    with open(PRIVATE_KEY_PATH, 'wb') as f:
         f.write(private_pem)
     
-    with open('keys/public_key.pem', 'wb') as f:
+    with open(PUBLIC_KEY_PATH, 'wb') as f:
         f.write(public_pem)
     
-    print("RSA key pair generated successfully!")
-    print("Private key: keys/private_key.pem")
-    print("Public key: keys/public_key.pem")
+    print(f"{algorithm} key pair generated successfully!")
+    print(f"Private key: {PRIVATE_KEY_PATH}")
+    print(f"Public key: {PUBLIC_KEY_PATH}")
+    return public_pem
+
+def rotate_keys(algorithm):
+    """Retire the active key pair and generate a new active one"""
+    from app import create_app
+    from models import db
+    from utils.crypto import _parse_public_key, key_algorithm, key_id_for
+    from utils.key_registry import assign_legacy_certificates, register_key
+    
+    with open(PUBLIC_KEY_PATH, 'rb') as f:
+        old_public_pem = f.read()
+    old_public_key = _parse_public_key(old_public_pem)
+    old_key_id = key_id_for(old_public_key)
+    
+    retired_dir = os.path.join(KEY_DIR, 'retired', old_key_id)
+    retired_private_path = os.path.join(retired_dir, 'private_key.pem')
+    
+    app = create_app()
+    with app.app_context():
+        register_key(old_public_pem, retired_private_path, active=False)
+        assigned = assign_legacy_certificates(old_key_id, key_algorithm(old_public_key))
+        db.session.commit()
+        print(f"Retired key {old_key_id}; {assigned} older certificate(s) assigned to it")
+        
+        os.makedirs(retired_dir, exist_ok=True)
+        os.replace(PRIVATE_KEY_PATH, retired_private_path)
+        os.replace(PUBLIC_KEY_PATH, os.path.join(retired_dir, 'public_key.pem'))
+        
+        new_public_pem = generate_key_pair(algorithm)
+        issuer = register_key(new_public_pem, PRIVATE_KEY_PATH, active=True)
+        db.session.commit()
+        print(f"Active key is now {issuer.key_id} ({issuer.algorithm})")
 
 if __name__ == '__main__':
-    generate_key_pair()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Generate a certificate signing key pair')
+    parser.add_argument('--algorithm', choices=sorted(GENERATORS), default='ed25519')
+    parser.add_argument('--rotate', action='store_true',
+                        help='retire the existing key pair and make a new one active')
+    args = parser.parse_args()
+    
+    if args.rotate:
+        if not os.path.exists(PUBLIC_KEY_PATH):
+            sys.exit("No active key to rotate. Run without --rotate first.")
+        rotate_keys(args.algorithm)
+    elif os.path.exists(PRIVATE_KEY_PATH):
+        # Never overwrite silently: every issued certificate would stop verifying
+        print("Keys already exist; keeping them. Use --rotate to replace them.")
+    else:
+        generate_key_pair(args.algorithm)
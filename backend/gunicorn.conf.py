@@ -0,0 +1,88 @@
+"""Production gunicorn settings: gunicorn -c gunicorn.conf.py "app:create_app()"
+
+Every value can be overridden from the environment (WEB_CONCURRENCY,
+GUNICORN_THREADS, PORT, ...) without editing this file.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Signature checks release the GIL, but the rest of a request does not, so
+# scale with processes and use a few threads each to overlap DB round trips
+#
+# Postgres connection budget: every worker has its own pool of DB_POOL_SIZE
+# (default GUNICORN_THREADS) + DB_MAX_OVERFLOW (default 2) connections, so
+# this server can open up to WEB_CONCURRENCY * (GUNICORN_THREADS + 2), e.g.
+# 9 * 6 = 54 on 4 CPUs, and as many again with DATABASE_REPLICA_URL. Keep
+# that, plus render workers and verify_service, under the plan's
+# max_connections (often 20-100 on small managed plans): lower
+# WEB_CONCURRENCY, or put PgBouncer in front and set DB_PGBOUNCER=true.
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Import the app (and parse keys, build the PDF template) once in the
+# master; workers inherit it copy-on-write instead of each paying for it
+preload_app = True
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Recycle workers now and then so slow leaks cannot build up; the jitter
+# keeps them from all restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+# Set GUNICORN_ACCESS_LOG= (empty) to turn access logging off
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+def on_starting(server):
+    """Drop metrics snapshots left by a previous run (METRICS_DIR)"""
+    from utils.metrics import METRICS_DIR, registry
+
+    if METRICS_DIR:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        registry.clear_snapshots()
+
+def when_ready(server):
+    """Warm per-process caches in the master before workers fork"""
+    from utils.crypto import key_manager
+
+    # Verify-only instances (APP_PROFILE=verify) need neither the private
+    # key nor the PDF template
+    verify_only = os.getenv('APP_PROFILE') == 'verify'
+    try:
+        if not verify_only:
+            key_manager.private_key()
+        key_manager.public_key()
+    except FileNotFoundError as e:
+        server.log.warning(f"Signing keys not preloaded: {e}")
+    if not verify_only:
+        from utils.pdf_generator import get_template
+        get_template()
+
+def post_fork(server, worker):
+    """Drop DB connections inherited from the master; each worker opens its own"""
+    from models import db
+
+    with server.app.wsgi().app_context():
+        # Primary and, when configured, the read replica bind
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+def worker_exit(server, worker):
+    """Write the worker's final metrics snapshot before it exits"""
+    from utils.metrics import registry
+
+    registry.flush()
+
+def child_exit(server, worker):
+    """Keep an exited worker's counters in the metrics archive"""
+    from utils.metrics import METRICS_DIR, registry
+
+    if METRICS_DIR:
+        registry.fold_worker(worker.pid)
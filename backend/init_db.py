@@ -1,15 +1,39 @@
 #!/usr/bin/env python3
-"""Initialize database with default admin user"""
+"""Create or migrate the schema and add the default admin user"""
 
-from app import app, db
-from models import Admin, Issuer
+from models import db, Admin
+from utils.key_registry import register_key
 import os
 
-def init_database():
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+# Schema of databases built with db.create_all() before deploys ran migrations
+INITIAL_REVISION = '961e4a72e279'
+
+def migrate_schema(app):
+    """Bring the schema up to the latest migration, however the database was created"""
+    from flask_migrate import Migrate, stamp, upgrade
+    from sqlalchemy import inspect
+
+    if 'migrate' not in app.extensions:
+        Migrate(app, db, directory=MIGRATIONS_DIR)
+    tables = set(inspect(db.engine).get_table_names())
+    if not tables - {'alembic_version'}:
+        # Fresh database: build the current schema, then mark it as migrated
+        db.create_all()
+        stamp(directory=MIGRATIONS_DIR, revision='head')
+    elif 'alembic_version' not in tables:
+        # create_all() never alters existing tables, so adopt the migration chain
+        print(f"Stamping unversioned database at {INITIAL_REVISION}")
+        stamp(directory=MIGRATIONS_DIR, revision=INITIAL_REVISION)
+        upgrade(directory=MIGRATIONS_DIR)
+    else:
+        upgrade(directory=MIGRATIONS_DIR)
+
+def init_database(app):
     """Initialize database with tables and default data"""
     with app.app_context():
-        # Create all tables
-        db.create_all()
+        # Create or migrate all tables
+        migrate_schema(app)
         
         # Create default admin user
         admin = Admin.query.filter_by(username='admin').first()
@@ -19,27 +43,20 @@ def init_database():
             db.session.add(admin)
             print("Default admin user created (username: admin, password: admin123)")
         
-        # Create issuer record
-        issuer = Issuer.query.filter_by(name='Puntland State University').first()
-        if not issuer:
-            # Read public key
-            public_key_path = 'keys/public_key.pem'
-            if os.path.exists(public_key_path):
-                with open(public_key_path, 'r') as f:
-                    public_key_pem = f.read()
-                
-                issuer = Issuer(
-                    name='Puntland State University',
-                    public_key_pem=public_key_pem,
-                    private_key_reference='keys/private_key.pem'
-                )
-                db.session.add(issuer)
-                print("Issuer record created")
-            else:
-                print("Warning: Public key not found. Run generate_keys.py first.")
+        # Register the active signing key in the issuer key registry
+        public_key_path = 'keys/public_key.pem'
+        if os.path.exists(public_key_path):
+            with open(public_key_path, 'r') as f:
+                public_key_pem = f.read()
+            
+            issuer = register_key(public_key_pem, 'keys/private_key.pem')
+            print(f"Issuer key {issuer.key_id} ({issuer.algorithm}) registered")
+        else:
+            print("Warning: Public key not found. Run generate_keys.py first.")
         
         db.session.commit()
         print("Database initialized successfully!")
 
 if __name__ == '__main__':
-    init_database()
\ No newline at end of file
+    from app import create_app
+    init_database(create_app())
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Add indexes for keyset-paginated certificate listing
+
+Revision ID: 3b7f2c9d1a64
+Revises: 961e4a72e279
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7f2c9d1a64'
+down_revision = '961e4a72e279'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_certificates_created_at_id', 'certificates', ['created_at', 'id'], unique=False)
+    op.create_index('ix_certificates_revoked_created_at_id', 'certificates', ['revoked', 'created_at', 'id'], unique=False)
+    op.create_index('ix_certificates_degree', 'certificates', ['degree'], unique=False)
+    op.create_index('ix_certificates_program', 'certificates', ['program'], unique=False)
+    op.create_index('ix_certificates_issue_date', 'certificates', ['issue_date'], unique=False)
+    op.create_index('ix_students_student_id_prefix', 'students', ['student_id'], unique=False,
+                    postgresql_ops={'student_id': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_students_student_id_prefix', table_name='students')
+    op.drop_index('ix_certificates_issue_date', table_name='certificates')
+    op.drop_index('ix_certificates_program', table_name='certificates')
+    op.drop_index('ix_certificates_degree', table_name='certificates')
+    op.drop_index('ix_certificates_revoked_created_at_id', table_name='certificates')
+    op.drop_index('ix_certificates_created_at_id', table_name='certificates')
@@ -0,0 +1,37 @@
+"""Track PDF/QR render job state on certificates
+
+Revision ID: 5d2e8a4f7c10
+Revises: 3b7f2c9d1a64
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a4f7c10'
+down_revision = '3b7f2c9d1a64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.add_column(sa.Column('render_status', sa.String(length=16), nullable=False, server_default='pending'))
+        batch_op.add_column(sa.Column('render_attempts', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('render_started_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('render_error', sa.Text(), nullable=True))
+        batch_op.create_index('ix_certificates_render_status', ['render_status'], unique=False)
+
+    # Certificates issued before the queue existed were rendered inline
+    op.execute("UPDATE certificates SET render_status = 'done' WHERE pdf_path IS NOT NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.drop_index('ix_certificates_render_status')
+        batch_op.drop_column('render_error')
+        batch_op.drop_column('render_started_at')
+        batch_op.drop_column('render_attempts')
+        batch_op.drop_column('render_status')
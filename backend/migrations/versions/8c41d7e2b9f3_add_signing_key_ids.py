@@ -0,0 +1,44 @@
+"""Record signing key IDs on certificates and turn issuers into a key registry
+
+Revision ID: 8c41d7e2b9f3
+Revises: 5d2e8a4f7c10
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41d7e2b9f3'
+down_revision = '5d2e8a4f7c10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.add_column(sa.Column('key_id', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('signature_algorithm', sa.String(length=32), nullable=True))
+
+    with op.batch_alter_table('issuers') as batch_op:
+        batch_op.add_column(sa.Column('key_id', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('algorithm', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('active', sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch_op.create_unique_constraint('uq_issuers_key_id', ['key_id'])
+
+    # Existing certificates keep key_id NULL and verify against the active
+    # RSA key; generate_keys.py --rotate assigns them its key ID before
+    # replacing it.
+
+
+def downgrade():
+    with op.batch_alter_table('issuers') as batch_op:
+        batch_op.drop_constraint('uq_issuers_key_id', type_='unique')
+        batch_op.drop_column('active')
+        batch_op.drop_column('algorithm')
+        batch_op.drop_column('key_id')
+
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.drop_column('signature_algorithm')
+        batch_op.drop_column('key_id')
@@ -0,0 +1,37 @@
+"""Add the revocation event log behind the published revocation list
+
+Revision ID: a93f1c6e0d27
+Revises: 8c41d7e2b9f3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a93f1c6e0d27'
+down_revision = '8c41d7e2b9f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('revocation_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('certificate_uuid', sa.String(length=36), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_revocation_events_certificate_uuid', 'revocation_events', ['certificate_uuid'], unique=False)
+
+    # Seed the log with certificates revoked before it existed
+    op.execute(
+        "INSERT INTO revocation_events (certificate_uuid, revoked_at) "
+        "SELECT uuid, CURRENT_TIMESTAMP FROM certificates WHERE revoked ORDER BY id"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_revocation_events_certificate_uuid', table_name='revocation_events')
+    op.drop_table('revocation_events')
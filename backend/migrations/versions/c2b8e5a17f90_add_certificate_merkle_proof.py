@@ -0,0 +1,26 @@
+"""Store Merkle inclusion proofs for batch-signed certificates
+
+Revision ID: c2b8e5a17f90
+Revises: a93f1c6e0d27
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2b8e5a17f90'
+down_revision = 'a93f1c6e0d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.add_column(sa.Column('merkle_proof', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.drop_column('merkle_proof')
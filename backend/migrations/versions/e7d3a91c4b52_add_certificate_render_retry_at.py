@@ -0,0 +1,26 @@
+"""Back off failed render jobs before retrying them
+
+Revision ID: e7d3a91c4b52
+Revises: c2b8e5a17f90
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7d3a91c4b52'
+down_revision = 'c2b8e5a17f90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.add_column(sa.Column('render_retry_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.drop_column('render_retry_at')
@@ -21,6 +21,11 @@ class Admin(db.Model):
 
 class Student(db.Model):
     __tablename__ = 'students'
+    __table_args__ = (
+        # Supports student_id LIKE 'prefix%' filters on Postgres regardless of collation
+        db.Index('ix_students_student_id_prefix', 'student_id',
+                 postgresql_ops={'student_id': 'varchar_pattern_ops'}),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(100), nullable=False)
@@ -33,6 +38,14 @@ class Student(db.Model):
 
 class Certificate(db.Model):
     __tablename__ = 'certificates'
+    __table_args__ = (
+        db.Index('ix_certificates_created_at_id', 'created_at', 'id'),
+        db.Index('ix_certificates_revoked_created_at_id', 'revoked', 'created_at', 'id'),
+        db.Index('ix_certificates_degree', 'degree'),
+        db.Index('ix_certificates_program', 'program'),
+        db.Index('ix_certificates_issue_date', 'issue_date'),
+        db.Index('ix_certificates_render_status', 'render_status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     uuid = db.Column(db.String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
@@ -45,12 +58,38 @@ class Certificate(db.Model):
     revoked = db.Column(db.Boolean, default=False)
     revoked_reason = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # PDF/QR render job state: pending -> rendering -> done | failed
+    render_status = db.Column(db.String(16), nullable=False, default='pending')
+    render_attempts = db.Column(db.Integer, nullable=False, default=0)
+    render_started_at = db.Column(db.DateTime, nullable=True)
+    # Earliest time a failed job may be claimed again
+    render_retry_at = db.Column(db.DateTime, nullable=True)
+    render_error = db.Column(db.Text, nullable=True)
+    # Signing key (Issuer.key_id) and algorithm; NULL on certificates issued
+    # before key IDs, which were signed with the active RSA key
+    key_id = db.Column(db.String(32), nullable=True)
+    signature_algorithm = db.Column(db.String(32), nullable=True)
+    # Inclusion proof when the signature covers a cohort's Merkle root
+    # (utils.merkle) rather than this certificate alone
+    merkle_proof = db.Column(db.Text, nullable=True)
+
+class RevocationEvent(db.Model):
+    """Append-only revocation log; the id doubles as the revocation list version"""
+    __tablename__ = 'revocation_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    certificate_uuid = db.Column(db.String(36), nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Issuer(db.Model):
+    """Signing key registry: one row per key, at most one active"""
     __tablename__ = 'issuers'
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     public_key_pem = db.Column(db.Text, nullable=False)
     private_key_reference = db.Column(db.String(500), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    key_id = db.Column(db.String(32), unique=True, nullable=True)
+    algorithm = db.Column(db.String(32), nullable=True)
+    active = db.Column(db.Boolean, nullable=False, default=True)
\ No newline at end of file
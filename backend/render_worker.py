@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Render worker: generates certificate QR codes and PDFs queued at issuance"""
+
+from app import create_app
+from utils.render_queue import run_worker
+import argparse
+import signal
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='seconds to sleep when idle')
+    args = parser.parse_args()
+
+    stopping = {'flag': False}
+
+    def request_stop(signum, frame):
+        # Finish the current job, then exit
+        stopping['flag'] = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    app = create_app()
+    print("Render worker started")
+    with app.app_context():
+        run_worker(poll_interval=args.poll_interval, should_stop=lambda: stopping['flag'])
+    print("Render worker stopped")
+
+if __name__ == '__main__':
+    main()
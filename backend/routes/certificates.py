@@ -1,15 +1,78 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required
-from models import Certificate, Student
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import load_only
+from models import Certificate, Issuer, RevocationEvent, Student
 from models import db
-from utils.crypto import sign_certificate, verify_certificate as verify_cert_signature
-from utils.pdf_generator import generate_certificate_pdf
-from utils.qr_generator import generate_qr_code
+from utils.crypto import (
+    build_certificate_payload, key_manager, sign_payload,
+    verify_certificate as verify_cert_signature
+)
+from utils.key_registry import issuer_public_key_pem  # noqa: F401 (installs the registry key resolver)
+from utils.cache import VerificationCache
+from utils.verification import certificate_verdict
+from utils.db_pool import read_session, replica_enabled
+from utils.qr_token import TokenError, decode_token
+from utils.revocation import revocation_list
+from utils.pagination import decode_cursor, encode_cursor, parse_limit
+from utils.export import export_fields, iter_csv, iter_ndjson
+from utils.issuance import (
+    SIGNING_MODES, certificate_pdf_key, issue_certificates_bulk, parse_graduates_csv,
+    render_certificate_files
+)
+from utils.pdf_cache import PdfCache, pdf_cache
+from utils.storage import PRESIGNED_URL_TTL, send_stored_file
+from utils.http_cache import (
+    DOWNLOAD_MAX_AGE, DOWNLOAD_STALE_WHILE_REVALIDATE, VERIFY_MAX_AGE,
+    VERIFY_STALE_WHILE_REVALIDATE, cache_publicly, download_etag
+)
+from utils.render_queue import PENDING_STATUSES, RETRY_AFTER_SECONDS, render_certificate, render_inline_enabled
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import threading
 import os
 
 bp = Blueprint('certificates', __name__, url_prefix='/api/certificates')
 
+# Verdicts for the public verify endpoint, keyed by certificate UUID.
+# Any route that changes a certificate must call verification_cache.invalidate().
+verification_cache = VerificationCache.from_env()
+
+# Columns each read endpoint needs; the signature is only loaded where it
+# is actually used, and pdf_path never is (PDFs come from the PDF cache).
+DETAIL_COLUMNS = (
+    Certificate.uuid, Certificate.degree, Certificate.program, Certificate.issue_date,
+    Certificate.revoked, Certificate.revoked_reason, Certificate.created_at,
+    Certificate.render_status
+)
+VERIFY_COLUMNS = (
+    Certificate.uuid, Certificate.degree, Certificate.program, Certificate.issue_date,
+    Certificate.signature, Certificate.key_id, Certificate.signature_algorithm,
+    Certificate.merkle_proof, Certificate.revoked, Certificate.revoked_reason
+)
+DOWNLOAD_COLUMNS = (
+    Certificate.uuid, Certificate.degree, Certificate.program, Certificate.issue_date,
+    Certificate.signature, Certificate.key_id, Certificate.merkle_proof, Certificate.render_status,
+    Certificate.revoked
+)
+STUDENT_COLUMNS = (Student.first_name, Student.last_name, Student.student_id)
+
+def load_certificate_row(uuid, certificate_columns, student_columns=STUDENT_COLUMNS, session=None):
+    """Fetch (certificate, student) for a UUID in a single joined query"""
+    return (session or db.session).query(Certificate, Student) \
+        .join(Student, Certificate.student_id == Student.id) \
+        .options(load_only(*certificate_columns), load_only(*student_columns)) \
+        .filter(Certificate.uuid == uuid) \
+        .first()
+
+def read_certificate_row(uuid, certificate_columns, student_columns=STUDENT_COLUMNS):
+    """load_certificate_row from the read replica, falling back to the
+    primary when the replica has not caught up with a new certificate yet"""
+    row = load_certificate_row(uuid, certificate_columns, student_columns, session=read_session())
+    if row is None and replica_enabled():
+        row = load_certificate_row(uuid, certificate_columns, student_columns)
+    return row
+
 # ============================================
 # ISSUE CERTIFICATE (PROTECTED)
 # ============================================
@@ -45,35 +108,76 @@ def issue_certificate():
     db.session.flush()
     
     # Payload for signature
-    payload = {
-        'uuid': certificate.uuid,
-        'student_name': f"{student.first_name} {student.last_name}",
-        'student_id': student.student_id,
-        'degree': certificate.degree,
-        'program': certificate.program,
-        'issue_date': certificate.issue_date.isoformat(),
-        'issuer': 'Puntland State University'
-    }
+    payload = build_certificate_payload(certificate, student)
     
-    signature = sign_certificate(payload)
-    certificate.signature = signature
+    signed = sign_payload(payload)
+    certificate.signature = signed['signature']
+    certificate.key_id = signed['key_id']
+    certificate.signature_algorithm = signed['algorithm']
     
-    # Generate QR
-    verification_url = f"https://psu-certificate-verification-live.vercel.app/verify/{certificate.uuid}"
-    qr_path = generate_qr_code(verification_url, certificate.uuid)
-    
-    # Generate PDF
-    pdf_path = generate_certificate_pdf(certificate, student, qr_path)
-    certificate.pdf_path = pdf_path
+    # Generate QR and PDF now, or leave the certificate pending for a render worker
+    if render_inline_enabled():
+        render_certificate(certificate, student)
     
     db.session.commit()
+    verification_cache.invalidate(certificate.uuid)
     
     return jsonify({
         'id': certificate.id,
         'uuid': certificate.uuid,
+        'render_status': certificate.render_status,
         'message': 'Certificate issued successfully'
     }), 201
 
+# ============================================
+# BULK ISSUE CERTIFICATES (PROTECTED)
+# ============================================
+MAX_BATCH_ROWS = int(os.getenv('BULK_ISSUE_MAX_ROWS', 10000))
+
+@bp.route('/batch', methods=['POST', 'OPTIONS'])
+@jwt_required()
+def issue_certificates_batch():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    # Accepts a JSON array, a text/csv body or a multipart CSV upload ("file")
+    if 'file' in request.files:
+        records = parse_graduates_csv(request.files['file'].read().decode('utf-8-sig'))
+    elif request.mimetype == 'text/csv':
+        records = parse_graduates_csv(request.get_data(as_text=True))
+    else:
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            return jsonify({'error': 'Expected a JSON array or CSV of graduates'}), 400
+    
+    if len(records) > MAX_BATCH_ROWS:
+        return jsonify({'error': f'Batch exceeds {MAX_BATCH_ROWS} rows'}), 413
+    
+    chunk_size = request.args.get('chunk_size')
+    if chunk_size is not None:
+        try:
+            chunk_size = int(chunk_size)
+        except ValueError:
+            chunk_size = 0
+        if chunk_size < 1:
+            return jsonify({'error': 'chunk_size must be an integer of at least 1'}), 400
+    
+    signing = request.args.get('signing')
+    if signing is not None and signing not in SIGNING_MODES:
+        return jsonify({'error': f"signing must be one of: {', '.join(SIGNING_MODES)}"}), 400
+    
+    results = issue_certificates_bulk(records, chunk_size=chunk_size, signing=signing)
+    
+    issued = [r for r in results if r['status'] == 'issued']
+    for result in issued:
+        verification_cache.invalidate(result['uuid'])
+    
+    return jsonify({
+        'issued': len(issued),
+        'failed': len(results) - len(issued),
+        'results': results
+    }), 201 if issued else 400
+
 # ============================================
 # LIST CERTIFICATES (PROTECTED)
 # ============================================
@@ -82,27 +186,159 @@ def issue_certificate():
 def list_certificates():
     if request.method == 'OPTIONS':
         return '', 200
+
+    # Keyset pagination, newest first, on (created_at, id)
     try:
-        certificates = db.session.query(Certificate, Student).join(Student).all()
+        limit = parse_limit(request.args.get('limit'))
+        filters = _listing_filters(request.args)
+        cursor = request.args.get('cursor')
+        if cursor:
+            created_at, cert_id = decode_cursor(cursor)
+            filters.append(tuple_(Certificate.created_at, Certificate.id) < tuple_(created_at, cert_id))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        rows = read_session().query(
+            Certificate.id, Certificate.uuid, Certificate.degree, Certificate.program,
+            Certificate.issue_date, Certificate.revoked, Certificate.created_at,
+            Student.first_name, Student.last_name, Student.student_id
+        ).join(Student, Certificate.student_id == Student.id) \
+            .filter(*filters) \
+            .order_by(Certificate.created_at.desc(), Certificate.id.desc()) \
+            .limit(limit + 1) \
+            .all()
     except Exception as e:
-        print(f"Database error: {e}")
+        current_app.logger.exception('Listing certificates failed')
         return jsonify({'error': 'Database error', 'details': str(e)}), 500
     
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
     result = []
-    for cert, student in certificates:
+    for row in rows:
         result.append({
-            'id': cert.id,
-            'uuid': cert.uuid,
-            'student_name': f"{student.first_name} {student.last_name}",
-            'student_id': student.student_id,
-            'degree': cert.degree,
-            'program': cert.program,
-            'issue_date': cert.issue_date.isoformat(),
-            'revoked': cert.revoked,
-            'created_at': cert.created_at.isoformat()
+            'id': row.id,
+            'uuid': row.uuid,
+            'student_name': f"{row.first_name} {row.last_name}",
+            'student_id': row.student_id,
+            'degree': row.degree,
+            'program': row.program,
+            'issue_date': row.issue_date,
+            'revoked': row.revoked,
+            'created_at': row.created_at
         })
     
-    return jsonify(result)
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    
+    return jsonify({
+        'certificates': result,
+        'next_cursor': next_cursor
+    })
+
+def _listing_filters(args):
+    """Translate listing query parameters into SQLAlchemy filter clauses"""
+    filters = []
+    
+    revoked = args.get('revoked')
+    if revoked is not None:
+        if revoked.lower() not in ('true', 'false'):
+            raise ValueError('revoked must be true or false')
+        filters.append(Certificate.revoked == (revoked.lower() == 'true'))
+    
+    if args.get('degree'):
+        filters.append(Certificate.degree == args['degree'])
+    if args.get('program'):
+        filters.append(Certificate.program == args['program'])
+    
+    issued_from = _parse_date_arg(args, 'issued_from')
+    if issued_from:
+        filters.append(Certificate.issue_date >= issued_from)
+    issued_to = _parse_date_arg(args, 'issued_to')
+    if issued_to:
+        filters.append(Certificate.issue_date <= issued_to)
+    
+    if args.get('student_id'):
+        prefix = args['student_id'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        filters.append(Student.student_id.like(prefix + '%', escape='\\'))
+    
+    return filters
+
+def _parse_date_arg(args, name):
+    if not args.get(name):
+        return None
+    try:
+        return datetime.strptime(args[name], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{name} must be YYYY-MM-DD')
+
+# ============================================
+# CERTIFICATE COUNTS (PROTECTED)
+# ============================================
+@bp.route('/stats', methods=['GET'])
+@jwt_required()
+def certificate_stats():
+    total, revoked = db.session.query(
+        func.count(Certificate.id),
+        func.count(Certificate.id).filter(Certificate.revoked == True)
+    ).one()
+    
+    return jsonify({
+        'total': total,
+        'valid': total - revoked,
+        'revoked': revoked
+    })
+
+# ============================================
+# EXPORT ALL CERTIFICATES (PROTECTED)
+# ============================================
+EXPORT_BATCH_SIZE = 1000
+
+@bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_certificates():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    
+    include = set(filter(None, request.args.get('include', '').split(',')))
+    unknown = include - {'signature', 'revocation'}
+    if unknown:
+        return jsonify({'error': f"Unknown include option(s): {', '.join(sorted(unknown))}"}), 400
+    
+    fields = export_fields(
+        include_signature='signature' in include,
+        include_revocation='revocation' in include
+    )
+    
+    columns = [
+        Certificate.id, Certificate.uuid, Certificate.degree, Certificate.program,
+        Certificate.issue_date, Certificate.revoked, Certificate.created_at,
+        Student.first_name, Student.last_name, Student.student_id
+    ]
+    if 'signature' in include:
+        columns += [Certificate.signature, Certificate.key_id, Certificate.signature_algorithm,
+                    Certificate.merkle_proof]
+    if 'revocation' in include:
+        columns.append(Certificate.revoked_reason)
+    
+    # yield_per streams through a server-side cursor, so memory stays flat
+    rows = db.session.query(*columns) \
+        .join(Student, Certificate.student_id == Student.id) \
+        .order_by(Certificate.id) \
+        .yield_per(EXPORT_BATCH_SIZE)
+    
+    if export_format == 'csv':
+        body, mimetype = iter_csv(rows, fields), 'text/csv'
+    else:
+        body, mimetype = iter_ndjson(rows, fields), 'application/x-ndjson'
+    
+    filename = f"certificates_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 # ============================================
 # GET CERTIFICATE DETAILS (PROTECTED)
@@ -113,11 +349,11 @@ def get_certificate(uuid):
     if request.method == 'OPTIONS':
         return '', 200
 
-    certificate = Certificate.query.filter_by(uuid=uuid).first()
-    if not certificate:
+    row = read_certificate_row(uuid, DETAIL_COLUMNS, STUDENT_COLUMNS + (Student.email,))
+    if not row:
         return jsonify({'error': 'Certificate not found'}), 404
     
-    student = Student.query.get(certificate.student_id)
+    certificate, student = row
     
     return jsonify({
         'id': certificate.id,
@@ -129,10 +365,11 @@ def get_certificate(uuid):
         },
         'degree': certificate.degree,
         'program': certificate.program,
-        'issue_date': certificate.issue_date.isoformat(),
+        'issue_date': certificate.issue_date,
         'revoked': certificate.revoked,
         'revoked_reason': certificate.revoked_reason,
-        'created_at': certificate.created_at.isoformat()
+        'render_status': certificate.render_status,
+        'created_at': certificate.created_at
     })
 
 # ============================================
@@ -140,53 +377,219 @@ def get_certificate(uuid):
 # ============================================
 @bp.route('/<uuid>/verify', methods=['GET'])
 def verify_certificate(uuid):
-    certificate = Certificate.query.filter_by(uuid=uuid).first()
+    verdict = _cached_verdict(uuid)
+    if verdict is None:
+        generation = verification_cache.generation(uuid)
+        verdict = _build_verification_verdict(uuid)
+        verification_cache.set(uuid, verdict, generation)
+
+    body, status_code, etag = verdict
+    # NOT_FOUND and INVALID have no ETag and stay uncacheable
+    if etag is None:
+        return jsonify(body), status_code
     
-    if not certificate:
-        return jsonify({
-            'status': 'NOT_FOUND',
-            'message': 'Certificate not found'
-        }), 404
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(body)
+        response.status_code = status_code
+    response.set_etag(etag)
+    return cache_publicly(response, VERIFY_MAX_AGE, VERIFY_STALE_WHILE_REVALIDATE)
+
+def _cached_verdict(uuid):
+    """Cached verdict, unless it is VALID for a certificate another process revoked"""
+    verdict = verification_cache.get(uuid)
+    if verdict is not None and verdict[0]['status'] == 'VALID' and revocation_list.is_revoked(uuid):
+        verification_cache.invalidate(uuid)
+        return None
+    return verdict
+
+def _build_verification_verdict(uuid):
+    """Return the (body, status_code, etag) verdict for a certificate UUID"""
+    return certificate_verdict(read_certificate_row(uuid, VERIFY_COLUMNS))
+
+# ============================================
+# BATCH VERIFY CERTIFICATES (PUBLIC)
+# ============================================
+VERIFY_BATCH_MAX = int(os.getenv('VERIFY_BATCH_MAX', 500))
+VERIFY_BATCH_THREADS = int(os.getenv('VERIFY_BATCH_THREADS', os.cpu_count() or 1))
+
+_verify_executor = None
+_verify_executor_lock = threading.Lock()
+
+def _get_verify_executor():
+    # Signature verification in cryptography releases the GIL, so threads scale across cores
+    global _verify_executor
+    if _verify_executor is None:
+        with _verify_executor_lock:
+            if _verify_executor is None:
+                _verify_executor = ThreadPoolExecutor(max_workers=VERIFY_BATCH_THREADS,
+                                                      thread_name_prefix='verify')
+    return _verify_executor
+
+@bp.route('/verify-batch', methods=['POST', 'OPTIONS'])
+def verify_certificates_batch():
+    if request.method == 'OPTIONS':
+        return '', 200
     
-    if certificate.revoked:
-        return jsonify({
-            'status': 'REVOKED',
-            'message': 'Certificate has been revoked',
-            'reason': certificate.revoked_reason
-        })
+    data = request.get_json(silent=True)
+    uuids = data.get('uuids') if isinstance(data, dict) else data
+    if not isinstance(uuids, list) or not all(isinstance(u, str) for u in uuids):
+        return jsonify({'error': 'Expected {"uuids": [...]} with a list of UUID strings'}), 400
     
-    student = Student.query.get(certificate.student_id)
+    if len(uuids) > VERIFY_BATCH_MAX:
+        return jsonify({'error': f'At most {VERIFY_BATCH_MAX} UUIDs per batch'}), 413
     
-    payload = {
-        'uuid': certificate.uuid,
-        'student_name': f"{student.first_name} {student.last_name}",
-        'student_id': student.student_id,
-        'degree': certificate.degree,
-        'program': certificate.program,
-        'issue_date': certificate.issue_date.isoformat(),
-        'issuer': 'Puntland State University'
-    }
+    verdicts = {}
+    for uuid in uuids:
+        verdict = _cached_verdict(uuid)
+        if verdict is not None:
+            verdicts[uuid] = verdict
     
-    is_valid = verify_cert_signature(payload, certificate.signature)
+    missing = list({uuid for uuid in uuids if uuid not in verdicts})
+    if missing:
+        generations = {uuid: verification_cache.generation(uuid) for uuid in missing}
+        rows = _load_verify_rows(read_session(), missing)
+        rows_by_uuid = {row[0].uuid: row for row in rows}
+        
+        # Certificates too new for the replica are read from the primary
+        lagging = [uuid for uuid in missing if uuid not in rows_by_uuid]
+        if lagging and replica_enabled():
+            rows += _load_verify_rows(db.session, lagging)
+            rows_by_uuid.update((row[0].uuid, row) for row in rows)
+        
+        # Resolve rotated-out keys here: the registry lookup needs the app context
+        for key_id in {row[0].key_id for row in rows} - {None}:
+            try:
+                key_manager.public_key_for(key_id)
+            except KeyError:
+                pass
+        
+        computed = _get_verify_executor().map(certificate_verdict, [rows_by_uuid.get(uuid) for uuid in missing])
+        for uuid, verdict in zip(missing, computed):
+            verdicts[uuid] = verdict
+            verification_cache.set(uuid, verdict, generations[uuid])
     
-    if is_valid:
-        return jsonify({
-            'status': 'VALID',
-            'message': 'Certificate is valid',
-            'certificate': {
-                'student_name': f"{student.first_name} {student.last_name}",
-                'student_id': student.student_id,
-                'degree': certificate.degree,
-                'program': certificate.program,
-                'issue_date': certificate.issue_date.isoformat(),
-                'issuer': 'Puntland State University'
-            }
-        })
-    else:
+    return jsonify({
+        'results': [dict(verdicts[uuid][0], uuid=uuid) for uuid in uuids]
+    })
+
+def _load_verify_rows(session, uuids):
+    return session.query(Certificate, Student) \
+        .join(Student, Certificate.student_id == Student.id) \
+        .options(load_only(*VERIFY_COLUMNS), load_only(*STUDENT_COLUMNS)) \
+        .filter(Certificate.uuid.in_(uuids)) \
+        .all()
+
+# ============================================
+# VERIFY OFFLINE QR TOKEN (PUBLIC)
+# ============================================
+MAX_TOKEN_LENGTH = 2048
+
+@bp.route('/verify-token', methods=['POST', 'OPTIONS'])
+def verify_certificate_token():
+    """Check a QR token statelessly: signature from the token, revocation from memory"""
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    data = request.get_json(silent=True)
+    token = data.get('token') if isinstance(data, dict) else None
+    if not isinstance(token, str) or len(token) > MAX_TOKEN_LENGTH:
+        return jsonify({'error': 'Expected {"token": "PSU1:..."}'}), 400
+    
+    try:
+        payload, signature, key_id = decode_token(token)
+    except TokenError as e:
+        return jsonify({'status': 'INVALID', 'message': str(e)}), 400
+    
+    if not verify_cert_signature(payload, signature, key_id):
         return jsonify({
             'status': 'INVALID',
             'message': 'Certificate signature is invalid'
         }), 400
+    
+    if revocation_list.is_revoked(payload['uuid']):
+        return jsonify({
+            'uuid': payload['uuid'],
+            'status': 'REVOKED',
+            'message': 'Certificate has been revoked'
+        })
+    
+    return jsonify({
+        'uuid': payload['uuid'],
+        'status': 'VALID',
+        'message': 'Certificate is valid',
+        'certificate': {
+            'student_name': payload['student_name'],
+            'student_id': payload['student_id'],
+            'degree': payload['degree'],
+            'program': payload['program'],
+            'issue_date': payload['issue_date'],
+            'issuer': payload['issuer']
+        }
+    })
+
+# ============================================
+# REVOCATION LIST (PUBLIC)
+# ============================================
+def _revocation_response(document, etag):
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(document)
+    response.set_etag(etag)
+    # Shared caches may hold a version for as long as this process does
+    response.cache_control.public = True
+    response.cache_control.max_age = int(revocation_list.ttl)
+    return response
+
+@bp.route('/revocations', methods=['GET'])
+def get_revocation_list():
+    """Signed revocation list; ?since=<version> returns only newer revocations"""
+    since = request.args.get('since')
+    if since is None:
+        document = revocation_list.full_document()
+        return _revocation_response(document, f"rev-{document['version']}")
+    
+    try:
+        since = int(since)
+    except ValueError:
+        return jsonify({'error': 'since must be an integer version'}), 400
+    if since < 0 or since > revocation_list.current():
+        return jsonify({'error': f'since must be between 0 and {revocation_list.version}'}), 400
+    
+    document = revocation_list.delta_document(since)
+    return _revocation_response(document, f"rev-{since}-{document['version']}")
+
+@bp.route('/revocations/bloom', methods=['GET'])
+def get_revocation_bloom():
+    """Signed bloom filter of revoked UUIDs; a hit means check /verify"""
+    document = revocation_list.bloom_document()
+    return _revocation_response(document, f"bloom-{document['version']}")
+
+# ============================================
+# SIGNING KEYS (PUBLIC)
+# ============================================
+@bp.route('/keys', methods=['GET'])
+def list_signing_keys():
+    """Public keys for offline token verification, active key first"""
+    issuers = Issuer.query.filter(Issuer.key_id.isnot(None)) \
+        .order_by(Issuer.active.desc(), Issuer.created_at.desc()) \
+        .all()
+    return jsonify({'keys': [{
+        'key_id': issuer.key_id,
+        'algorithm': issuer.algorithm,
+        'active': issuer.active,
+        'public_key_pem': issuer.public_key_pem
+    } for issuer in issuers]})
+
+# ============================================
+# VERIFICATION CACHE STATS (PROTECTED)
+# ============================================
+@bp.route('/verify-cache/stats', methods=['GET'])
+@jwt_required()
+def verification_cache_stats():
+    return jsonify(verification_cache.stats())
 
 # ============================================
 # REVOKE CERTIFICATE (PROTECTED)
@@ -202,23 +605,100 @@ def revoke_certificate(uuid):
         return jsonify({'error': 'Certificate not found'}), 404
     
     data = request.get_json()
+    if not certificate.revoked:
+        db.session.add(RevocationEvent(certificate_uuid=uuid))
     certificate.revoked = True
     certificate.revoked_reason = data.get('reason', 'No reason provided')
     
     db.session.commit()
+    verification_cache.invalidate(uuid)
+    revocation_list.refresh()
     
     return jsonify({'message': 'Certificate revoked successfully'})
 
 # ============================================
 # DOWNLOAD CERTIFICATE PDF (PUBLIC)
 # ============================================
+def _render_missing_pdf(certificate, student):
+    """Render a PDF that is not in the cache; returns an error response or None"""
+    # Verify-only instances carry no rendering stack; the proxy can retry
+    # the 503 against an issuance instance, which renders and stores it
+    if current_app.config.get('APP_PROFILE') == 'verify':
+        response = jsonify({'error': 'Certificate PDF is not available on this instance'})
+        response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+        return response, 503
+    try:
+        render_certificate_files(certificate, student)
+    except Exception:
+        current_app.logger.exception('Rendering certificate %s failed', certificate.uuid)
+        return jsonify({'error': 'Certificate PDF could not be generated'}), 500
+    return None
+
+def _send_certificate_pdf(uuid, etag, validator):
+    return send_stored_file(
+        PdfCache.object_key(etag),
+        mimetype='application/pdf',
+        download_name=f'certificate_{uuid}.pdf',
+        etag=validator
+    )
+
 @bp.route('/<uuid>/download', methods=['GET'])
 def download_certificate(uuid):
-    certificate = Certificate.query.filter_by(uuid=uuid).first()
-    if not certificate or not certificate.pdf_path:
+    row = read_certificate_row(uuid, DOWNLOAD_COLUMNS)
+    if not row:
         return jsonify({'error': 'Certificate or PDF not found'}), 404
     
-    if not os.path.exists(certificate.pdf_path):
-        return jsonify({'error': 'PDF file not found'}), 404
+    certificate, student = row
+    
+    # PDFs are rendered deterministically, so the content hash doubles as a
+    # strong ETag; revocation changes it, and revoked PDFs are never cached publicly
+    etag = certificate_pdf_key(certificate, student)
+    validator = download_etag(etag, certificate.revoked)
+    if request.if_none_match.contains_weak(validator):
+        response = Response(status=304)
+        response.set_etag(validator)
+        if certificate.revoked:
+            return response
+        return cache_publicly(response, DOWNLOAD_MAX_AGE, DOWNLOAD_STALE_WHILE_REVALIDATE)
     
-    return send_file(certificate.pdf_path, as_attachment=True)
+    if not pdf_cache.contains(etag):
+        if certificate.render_status in PENDING_STATUSES:
+            response = jsonify({
+                'status': certificate.render_status.upper(),
+                'message': 'Certificate PDF is still being generated',
+                'retry_after': RETRY_AFTER_SECONDS
+            })
+            response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+            return response, 202
+        
+        # Missing here (new instance, evicted, other node rendered it): rebuild from the row
+        error = _render_missing_pdf(certificate, student)
+        if error:
+            return error
+    
+    # Pre-signed redirect when the backend supports it, else a ranged stream
+    try:
+        response = _send_certificate_pdf(uuid, etag, validator)
+    except FileNotFoundError:
+        # Evicted by another process's cache sweep since the check above
+        error = _render_missing_pdf(certificate, student)
+        if error:
+            return error
+        response = _send_certificate_pdf(uuid, etag, validator)
+    if certificate.revoked:
+        return response
+    if response.status_code == 302:
+        # A cached redirect must not outlive the pre-signed URL it points to
+        return cache_publicly(response, min(DOWNLOAD_MAX_AGE, PRESIGNED_URL_TTL // 2))
+    if response.status_code in (200, 206, 304):
+        return cache_publicly(response, DOWNLOAD_MAX_AGE, DOWNLOAD_STALE_WHILE_REVALIDATE)
+    return response
+
+# ============================================
+# VERIFY-ONLY PROFILE
+# ============================================
+# Registered instead of bp on APP_PROFILE=verify instances: only the two
+# public read routes, under the same endpoint names
+verify_bp = Blueprint('certificates', __name__, url_prefix='/api/certificates')
+verify_bp.add_url_rule('/<uuid>/verify', view_func=verify_certificate, methods=['GET'])
+verify_bp.add_url_rule('/<uuid>/download', view_func=download_certificate, methods=['GET'])
@@ -0,0 +1,44 @@
+from flask import Blueprint, Response, request, jsonify
+from flask_jwt_extended import jwt_required
+from utils import metrics
+from utils.db_pool import pool_stats
+import os
+
+bp = Blueprint('system', __name__)
+
+@bp.route('/')
+def health_check():
+    return jsonify({
+        'status': 'healthy',
+        'message': 'PSU Certificate Verification API',
+        'version': '1.0.0'
+    })
+
+@bp.route('/health')
+def health():
+    return jsonify({'status': 'ok'})
+
+@bp.route('/health/db-pool')
+@jwt_required()
+def health_db_pool():
+    """Connection pool usage per engine (primary, replica)"""
+    return jsonify(pool_stats())
+
+@bp.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint; set METRICS_TOKEN to require a bearer token"""
+    token = os.getenv('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@bp.route('/test-login', methods=['GET', 'POST', 'OPTIONS'])
+def test_login():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    return jsonify({
+        'status': 'success',
+        'message': f'Login endpoint is working - Method: {request.method}',
+        'data': request.get_json() if request.get_json() else 'No data received'
+    })
@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def app(monkeypatch):
+    """App on an empty in-memory database, inside an app context"""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,40 @@
+import os
+import time
+
+from utils.pdf_cache import PdfCache
+from utils.storage import LocalStorage
+
+def store(cache, key, size, age):
+    object_key = cache.put(key, b'%' * size)
+    mtime = time.time() - age
+    os.utime(cache.storage.local_path(object_key), (mtime, mtime))
+
+def test_sweep_evicts_least_recently_used_across_processes(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    # Two caches on one directory stand in for two worker processes
+    first = PdfCache(storage, max_bytes=250, sweep_interval=3600)
+    second = PdfCache(storage, max_bytes=250, sweep_interval=3600)
+    first._last_sweep = second._last_sweep = time.monotonic()
+    store(first, 'a', 100, age=30)
+    store(second, 'b', 100, age=20)
+    store(first, 'c', 100, age=10)
+    assert second.contains('a')
+
+    assert second.sweep() == 1
+    assert first.contains('a') and first.contains('c')
+    assert not first.contains('b')
+
+def test_sweep_skips_while_another_process_holds_the_lock(tmp_path):
+    import fcntl
+    storage = LocalStorage(str(tmp_path))
+    cache = PdfCache(storage, max_bytes=1, sweep_interval=3600)
+    cache._last_sweep = time.monotonic()
+    store(cache, 'a', 100, age=10)
+    store(cache, 'b', 100, age=0)
+    with open(tmp_path / PdfCache.LOCK_NAME, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        assert cache.sweep() is None
+    assert cache.sweep() == 1
+
+def test_shared_storage_is_never_swept():
+    assert PdfCache(object(), max_bytes=100).max_bytes == 0
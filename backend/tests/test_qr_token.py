@@ -0,0 +1,85 @@
+from datetime import date
+from types import SimpleNamespace
+import base64
+import pytest
+
+from utils.qr_token import (
+    TOKEN_PREFIX, TokenError, b45decode, b45encode, cbor_decode, cbor_encode,
+    decode_token, encode_token
+)
+
+def make_token():
+    certificate = SimpleNamespace(
+        uuid='3f2b8c1e-4d5a-4b6c-8d7e-9f0a1b2c3d4e', degree='Bachelor of Science',
+        program='Computer Science', issue_date=date(2024, 6, 1),
+        signature=base64.b64encode(b'\x01' * 64).decode('ascii'))
+    student = SimpleNamespace(first_name='Ada', last_name='Lovelace', student_id='PSU-0001')
+    return encode_token(certificate, student, 'ab' * 8)
+
+def test_base45_round_trip():
+    for data in (b'', b'\x00', b'AB', b'ietf!', bytes(range(256))):
+        assert b45decode(b45encode(data)) == data
+
+def test_base45_rfc_vectors():
+    assert b45encode(b'AB') == 'BB8'
+    assert b45encode(b'Hello!!') == '%69 VD92EX0'
+    assert b45decode('QED8WEX0') == b'ietf!'
+
+@pytest.mark.parametrize('text', ['abc', 'BB8#', 'B', 'GGW'])
+def test_base45_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        b45decode(text)
+
+def test_cbor_round_trip():
+    value = [0, 23, 24, 255, 65536, 2 ** 40, b'', b'\xff' * 300, '', 'Zoë', ['nested']]
+    assert cbor_decode(cbor_encode(value[:-1])) == value[:-1]
+    for item in value:
+        assert cbor_decode(cbor_encode(item)) == item
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\x18',          # uint with a missing length byte
+    b'\x45abc',       # 5-byte string with 3 bytes
+    b'\x83\x01\x02',  # 3-item array with 2 items
+    b'\x9b' + b'\xff' * 8,
+])
+def test_cbor_rejects_truncated_input(data):
+    with pytest.raises((ValueError, IndexError)):
+        cbor_decode(data)
+
+@pytest.mark.parametrize('data', [b'\x20', b'\xa0', b'\xc0\x00', b'\xf5', b'\x5f'])
+def test_cbor_rejects_unsupported_types(data):
+    with pytest.raises(ValueError):
+        cbor_decode(data)
+
+def test_cbor_rejects_trailing_bytes():
+    with pytest.raises(ValueError):
+        cbor_decode(b'\x00\x00')
+
+def test_cbor_rejects_deep_nesting():
+    with pytest.raises(ValueError):
+        cbor_decode(b'\x81' * 1300 + b'\x00')
+
+def test_token_round_trip():
+    payload, signature, key_id = decode_token(make_token())
+    assert payload['uuid'] == '3f2b8c1e-4d5a-4b6c-8d7e-9f0a1b2c3d4e'
+    assert payload['student_name'] == 'Ada Lovelace'
+    assert payload['issue_date'] == '2024-06-01'
+    assert base64.b64decode(signature) == b'\x01' * 64
+    assert key_id == 'ab' * 8
+
+@pytest.mark.parametrize('token', [
+    None,
+    'PSU2:000',
+    TOKEN_PREFIX + 'abc',
+    TOKEN_PREFIX + b45encode(cbor_encode([1, 2, 3])),
+    TOKEN_PREFIX + b45encode(b'\x81' * 1300 + b'\x00'),
+])
+def test_decode_token_raises_token_error(token):
+    with pytest.raises(TokenError):
+        decode_token(token)
+
+def test_truncated_token_raises_token_error():
+    token = make_token()
+    with pytest.raises(TokenError):
+        decode_token(token[:len(token) // 2 // 3 * 3])
@@ -0,0 +1,48 @@
+from datetime import date, datetime, timedelta
+
+from models import db, Certificate, Student
+from utils import render_queue
+
+def queue_certificate():
+    student = Student(first_name='Ada', last_name='Lovelace', student_id='PSU-0001')
+    db.session.add(student)
+    db.session.flush()
+    certificate = Certificate(student_id=student.id, degree='Bachelor of Science',
+                              program='Computer Science', issue_date=date(2024, 6, 1),
+                              signature='sig', render_status='pending')
+    db.session.add(certificate)
+    db.session.commit()
+    return certificate.id
+
+def fail_render(certificate, student):
+    raise RuntimeError('template missing')
+
+def test_failed_job_backs_off_then_fails(app, monkeypatch):
+    monkeypatch.setattr(render_queue, 'render_certificate', fail_render)
+    cert_id = queue_certificate()
+
+    assert render_queue.claim_next_job() == cert_id
+    assert render_queue.process_job(cert_id) == 'pending'
+    certificate = db.session.get(Certificate, cert_id)
+    assert certificate.render_retry_at > datetime.utcnow()
+    assert render_queue.claim_next_job() is None
+
+    for attempt in range(2, render_queue.MAX_ATTEMPTS + 1):
+        certificate.render_retry_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        assert render_queue.claim_next_job() == cert_id
+        status = render_queue.process_job(cert_id)
+    assert status == 'failed'
+    assert certificate.render_error == 'template missing'
+
+def test_job_abandoned_by_dying_workers_fails(app, monkeypatch):
+    monkeypatch.setattr(render_queue, 'render_certificate', fail_render)
+    cert_id = queue_certificate()
+    certificate = db.session.get(Certificate, cert_id)
+    certificate.render_status = 'rendering'
+    certificate.render_attempts = render_queue.MAX_ATTEMPTS
+    certificate.render_started_at = datetime.utcnow() - render_queue.STALE_AFTER * 2
+    db.session.commit()
+
+    assert render_queue.claim_next_job() == cert_id
+    assert render_queue.process_job(cert_id) == 'failed'
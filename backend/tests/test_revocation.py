@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+import uuid as uuid_lib
+
+from models import db, RevocationEvent
+from utils.revocation import RevocationList
+
+def add_event(event_id, revoked_at=None):
+    uuid = str(uuid_lib.uuid4())
+    db.session.add(RevocationEvent(id=event_id, certificate_uuid=uuid,
+                                   revoked_at=revoked_at or datetime.utcnow()))
+    db.session.commit()
+    return uuid
+
+def test_late_commit_holds_version_until_it_appears(app):
+    revocations = RevocationList(ttl=60, gap_timeout=60)
+    first = add_event(1)
+    third = add_event(3)
+    revocations.refresh()
+    assert revocations.is_revoked(third)
+    assert revocations.version == 1
+
+    second = add_event(2)
+    revocations.refresh()
+    assert revocations.is_revoked(second)
+    assert revocations.version == 3
+    assert revocations._uuids == [uuid_lib.UUID(u).bytes for u in (first, second, third)]
+
+def test_gap_is_given_up_after_timeout(app):
+    revocations = RevocationList(ttl=60, gap_timeout=60)
+    add_event(1)
+    add_event(3, revoked_at=datetime.utcnow() - timedelta(seconds=120))
+    revocations.refresh()
+    assert revocations.version == 3
+
+def test_refresh_skips_query_when_fresh(app):
+    revocations = RevocationList(ttl=60)
+    revocations.refresh()
+    uuid = add_event(1)
+    revocations.refresh(max_age=60)
+    assert not revocations.is_revoked(uuid)
+    revocations.refresh()
+    assert revocations.is_revoked(uuid)
@@ -0,0 +1,148 @@
+from collections import OrderedDict
+import threading
+import time
+import os
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+class VerificationCache:
+    """Cache of public verification verdicts keyed by certificate UUID.
+
+    VALID and REVOKED verdicts are stable and kept for the full TTL.
+    NOT_FOUND and INVALID verdicts go to a separate, smaller store with a
+    short TTL so a flood of guessed UUIDs cannot push real entries out.
+
+    A verdict computed from a row read before an invalidate() must not be
+    stored after it: callers take generation(uuid) before loading the row
+    and pass it to set(), which drops the verdict if the UUID has been
+    invalidated since. Generations are kept in a fixed number of slots, so
+    an unrelated invalidation occasionally costs a skipped store.
+
+    The cache is per process; the Flask routes and verify_service check
+    cached VALID verdicts against the revocation list, so other workers see
+    a revocation within REVOCATION_LIST_TTL.
+    """
+
+    STABLE_STATUSES = ('VALID', 'REVOKED')
+    GENERATION_SLOTS = 4096
+
+    def __init__(self, maxsize=10000, ttl=300, negative_maxsize=1000, negative_ttl=30):
+        self.positive = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.negative = TTLCache(maxsize=negative_maxsize, ttl=negative_ttl)
+        self.hits = 0
+        self.misses = 0
+        self._generations = [0] * self.GENERATION_SLOTS
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            maxsize=int(os.getenv('VERIFY_CACHE_SIZE', 10000)),
+            ttl=float(os.getenv('VERIFY_CACHE_TTL', 300)),
+            negative_maxsize=int(os.getenv('VERIFY_CACHE_NEGATIVE_SIZE', 1000)),
+            negative_ttl=float(os.getenv('VERIFY_CACHE_NEGATIVE_TTL', 30))
+        )
+
+    def get(self, uuid):
+        verdict = self.positive.get(uuid)
+        if verdict is None:
+            verdict = self.negative.get(uuid)
+        if verdict is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return verdict
+
+    def generation(self, uuid):
+        """Take before loading the row a verdict is computed from"""
+        return self._generations[hash(uuid) % self.GENERATION_SLOTS]
+
+    def set(self, uuid, verdict, generation=None):
+        """Store a (body, status_code, etag) verdict unless uuid was invalidated since generation"""
+        body = verdict[0]
+        with self._lock:
+            if generation is not None and generation != self.generation(uuid):
+                return
+            if body.get('status') in self.STABLE_STATUSES:
+                self.negative.invalidate(uuid)
+                self.positive.set(uuid, verdict)
+            else:
+                self.positive.invalidate(uuid)
+                self.negative.set(uuid, verdict)
+
+    def invalidate(self, uuid):
+        with self._lock:
+            self._generations[hash(uuid) % self.GENERATION_SLOTS] += 1
+            self.positive.invalidate(uuid)
+            self.negative.invalidate(uuid)
+
+    def clear(self):
+        self.positive.clear()
+        self.negative.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.positive.evictions + self.negative.evictions,
+            'positive': self.positive.stats(),
+            'negative': self.negative.stats()
+        }
@@ -0,0 +1,80 @@
+from utils.metrics import timed
+import gzip
+import os
+
+# Negotiated response compression for buffered JSON and text responses.
+# gzip is always available; br needs `brotli` and zstd needs `zstandard`
+# (pip install brotli zstandard) and are only offered when installed.
+COMPRESS_ENCODINGS = [e.strip() for e in os.getenv('COMPRESS_ENCODINGS', 'zstd,br,gzip').split(',') if e.strip()]
+# Below this many bytes compression costs more than it saves
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+ZSTD_LEVEL = int(os.getenv('COMPRESS_ZSTD_LEVEL', 3))
+
+COMPRESSIBLE_MIMETYPES = (
+    'application/json', 'application/x-ndjson', 'text/csv', 'text/html', 'text/plain'
+)
+
+_compressors = None
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+def _load_compressors():
+    """Compress functions for each configured encoding whose library is installed"""
+    available = {'gzip': _gzip}
+    try:
+        import brotli
+        available['br'] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        # ZstdCompressor instances must not be shared between threads
+        available['zstd'] = lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    except ImportError:
+        pass
+    return {name: available[name] for name in COMPRESS_ENCODINGS if name in available}
+
+def compressors():
+    global _compressors
+    if _compressors is None:
+        _compressors = _load_compressors()
+    return _compressors
+
+def negotiate(accept_encodings):
+    """Best configured encoding for a parsed Accept-Encoding header, or None"""
+    return accept_encodings.best_match(list(compressors()))
+
+@timed('compress_response')
+def compress_response(response):
+    """after_request hook: compress the body in the best encoding the client accepts.
+
+    Streamed and file responses (exports, PDFs) pass through untouched.
+    """
+    from flask import request
+
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    response.set_data(compressors()[encoding](data))
+    response.headers['Content-Encoding'] = encoding
+    # The encoded bytes differ from the identity representation, so a
+    # strong validator would be wrong; If-None-Match compares weakly anyway
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
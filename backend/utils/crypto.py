@@ -1,68 +1,298 @@
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa, padding
+from utils import merkle
+from utils.cache import TTLCache
+from utils.metrics import timed
+import hashlib
+import threading
 import json
 import base64
 import os
 
+ISSUER_NAME = 'Puntland State University'
+
+PRIVATE_KEY_FILE = 'private_key.pem'
+PUBLIC_KEY_FILE = 'public_key.pem'
+
+# Signature algorithms, as recorded in Certificate.signature_algorithm and
+# Issuer.algorithm. Certificates with no algorithm recorded predate key IDs
+# and were signed with RSA-PSS.
+RSA_PSS_SHA256 = 'rsa-pss-sha256'
+ECDSA_P256_SHA256 = 'ecdsa-p256-sha256'
+ED25519 = 'ed25519'
+ALGORITHMS = (ED25519, ECDSA_P256_SHA256, RSA_PSS_SHA256)
+
+def _pss_padding():
+    return padding.PSS(
+        mgf=padding.MGF1(hashes.SHA256()),
+        salt_length=padding.PSS.MAX_LENGTH
+    )
+
+def _parse_private_key(data):
+    return serialization.load_pem_private_key(data, password=None)
+
+def _parse_public_key(data):
+    return serialization.load_pem_public_key(data)
+
+def key_algorithm(key):
+    """Signature algorithm name for a private or public key"""
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return ED25519
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if key.curve.name != 'secp256r1':
+            raise ValueError(f"Unsupported EC curve: {key.curve.name}")
+        return ECDSA_P256_SHA256
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return RSA_PSS_SHA256
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+def key_id_for(key):
+    """Stable key ID: the first 16 hex digits of sha256 over the public key's DER"""
+    if not hasattr(key, 'public_bytes'):
+        key = key.public_key()
+    der = key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(der).hexdigest()[:16]
+
+def sign_bytes(private_key, data):
+    """Sign raw bytes with whichever algorithm the key belongs to"""
+    algorithm = key_algorithm(private_key)
+    if algorithm == ED25519:
+        return private_key.sign(data)
+    if algorithm == ECDSA_P256_SHA256:
+        return private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+    return private_key.sign(data, _pss_padding(), hashes.SHA256())
+
+def verify_bytes(public_key, signature, data, algorithm=None):
+    """Verify raw bytes; raises cryptography's InvalidSignature on mismatch"""
+    algorithm = algorithm or key_algorithm(public_key)
+    if algorithm == ED25519:
+        public_key.verify(signature, data)
+    elif algorithm == ECDSA_P256_SHA256:
+        public_key.verify(signature, data, ec.ECDSA(hashes.SHA256()))
+    else:
+        public_key.verify(signature, data, _pss_padding(), hashes.SHA256())
+
 def load_private_key():
     """Load private key from file"""
-    key_path = os.path.join('keys', 'private_key.pem')
+    key_path = os.path.join('keys', PRIVATE_KEY_FILE)
     if not os.path.exists(key_path):
         raise FileNotFoundError("Private key not found. Run generate_keys.py first.")
-    
+
     with open(key_path, 'rb') as f:
-        private_key = serialization.load_pem_private_key(
-            f.read(),
-            password=None
-        )
+        private_key = _parse_private_key(f.read())
     return private_key
 
 def load_public_key():
     """Load public key from file"""
-    key_path = os.path.join('keys', 'public_key.pem')
+    key_path = os.path.join('keys', PUBLIC_KEY_FILE)
     if not os.path.exists(key_path):
         raise FileNotFoundError("Public key not found. Run generate_keys.py first.")
-    
+
     with open(key_path, 'rb') as f:
-        public_key = serialization.load_pem_public_key(f.read())
+        public_key = _parse_public_key(f.read())
     return public_key
 
+class KeyManager:
+    """Per-process cache of parsed signing keys.
+
+    Each key file is read and parsed once. Later lookups only stat the file;
+    the key is re-read when its mtime or size changes and re-parsed only if
+    the content hash differs from the cached one.
+
+    The files under key_dir hold the active key pair. Public keys of other
+    (rotated-out) keys are fetched by key ID through `resolver`, a callable
+    returning PEM bytes or None, and cached for the life of the process.
+    """
+
+    def __init__(self, key_dir='keys', resolver=None):
+        self.key_dir = key_dir
+        self.resolver = resolver
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._registered = {}
+
+    def private_key(self):
+        return self._private_entry()['key']
+
+    def public_key(self):
+        return self._public_entry()['key']
+
+    def signing_key(self):
+        """Return (key_id, algorithm, private_key) for the active key"""
+        entry = self._private_entry()
+        return entry['key_id'], entry['algorithm'], entry['key']
+
+    def public_key_for(self, key_id=None):
+        """Public key for a key ID; None means the active key"""
+        if key_id is None:
+            return self.public_key()
+
+        key = self._registered.get(key_id)
+        if key is not None:
+            return key
+
+        try:
+            entry = self._public_entry()
+            if entry['key_id'] == key_id:
+                return entry['key']
+        except FileNotFoundError:
+            pass
+
+        pem = self.resolver(key_id) if self.resolver is not None else None
+        if pem:
+            key = _parse_public_key(pem)
+            if key_id_for(key) == key_id:
+                self._registered[key_id] = key
+                return key
+        raise KeyError(f"Unknown signing key ID: {key_id}")
+
+    def add_public_key(self, pem):
+        """Cache a public key for public_key_for(); returns its key ID.
+
+        For callers that fetch registry keys themselves (e.g. with an async
+        driver) instead of through the synchronous resolver.
+        """
+        key = _parse_public_key(pem)
+        key_id = key_id_for(key)
+        self._registered[key_id] = key
+        return key_id
+
+    def reload(self):
+        """Drop all cached keys so the next lookup re-reads them from disk"""
+        with self._lock:
+            self._entries.clear()
+            self._registered.clear()
+
+    def _private_entry(self):
+        return self._get(PRIVATE_KEY_FILE, _parse_private_key,
+                         "Private key not found. Run generate_keys.py first.")
+
+    def _public_entry(self):
+        return self._get(PUBLIC_KEY_FILE, _parse_public_key,
+                         "Public key not found. Run generate_keys.py first.")
+
+    def _get(self, filename, parse, missing_message):
+        path = os.path.join(self.key_dir, filename)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(missing_message)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        entry = self._entries.get(filename)
+        if entry is not None and entry['stamp'] == stamp:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None and entry['stamp'] == stamp:
+                return entry
+
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+
+            if entry is not None and entry['digest'] == digest:
+                entry = dict(entry, stamp=stamp)
+            else:
+                key = parse(data)
+                entry = {'stamp': stamp, 'digest': digest, 'key': key,
+                         'key_id': key_id_for(key), 'algorithm': key_algorithm(key)}
+            self._entries[filename] = entry
+            return entry
+
+key_manager = KeyManager()
+
+def reload_keys():
+    """Force the process-wide key cache to reload keys on next use"""
+    key_manager.reload()
+
+def build_certificate_payload(certificate, student):
+    """Build the signed payload for a certificate and its student"""
+    return {
+        'uuid': certificate.uuid,
+        'student_name': f"{student.first_name} {student.last_name}",
+        'student_id': student.student_id,
+        'degree': certificate.degree,
+        'program': certificate.program,
+        'issue_date': certificate.issue_date.isoformat(),
+        'issuer': ISSUER_NAME
+    }
+
 def create_canonical_payload(payload):
     """Create canonical JSON representation"""
     return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
 
+@timed('sign_payload')
+def sign_payload(payload):
+    """Sign certificate payload with the active key.
+
+    Returns {'signature', 'key_id', 'algorithm'}; all three are stored on
+    the certificate.
+    """
+    key_id, algorithm, private_key = key_manager.signing_key()
+    signature = sign_bytes(private_key, create_canonical_payload(payload))
+    return {
+        'signature': base64.b64encode(signature).decode('utf-8'),
+        'key_id': key_id,
+        'algorithm': algorithm
+    }
+
+@timed('sign_payloads_merkle')
+def sign_payloads_merkle(payloads):
+    """Sign a cohort of payloads with one private-key operation.
+
+    The canonical payloads become the leaves of a Merkle tree and only the
+    root is signed. Returns one {'signature', 'key_id', 'algorithm',
+    'merkle_proof'} per payload; the signature (of the root) is shared.
+    """
+    key_id, algorithm, private_key = key_manager.signing_key()
+    root, proofs = merkle.build_tree([create_canonical_payload(p) for p in payloads])
+    signature = base64.b64encode(sign_bytes(private_key, merkle.root_message(root))).decode('utf-8')
+    return [{
+        'signature': signature,
+        'key_id': key_id,
+        'algorithm': algorithm,
+        'merkle_proof': merkle.dump_proof(proof)
+    } for proof in proofs]
+
+# Merkle roots whose signature has already been checked, so verifying the
+# rest of a cohort is only hashing
+_verified_roots = TTLCache(maxsize=4096, ttl=3600)
+
+@timed('sign_certificate')
 def sign_certificate(payload):
     """Sign certificate payload with private key"""
-    private_key = load_private_key()
-    canonical_payload = create_canonical_payload(payload)
-    
-    signature = private_key.sign(
-        canonical_payload,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
-    
-    return base64.b64encode(signature).decode('utf-8')
+    return sign_payload(payload)['signature']
+
+@timed('verify_certificate')
+def verify_certificate(payload, signature_b64, key_id=None, algorithm=None, merkle_proof=None):
+    """Verify certificate signature with public key.
 
-def verify_certificate(payload, signature_b64):
-    """Verify certificate signature with public key"""
+    key_id selects the key (None: the active key). If algorithm is given it
+    must match the key's algorithm, so a signature can never be checked
+    under a different scheme than it was made with. With a merkle_proof the
+    signature covers the cohort's Merkle root, recomputed from the payload.
+    """
     try:
-        public_key = load_public_key()
-        canonical_payload = create_canonical_payload(payload)
-        signature = base64.b64decode(signature_b64)
-        
-        public_key.verify(
-            signature,
-            canonical_payload,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        public_key = key_manager.public_key_for(key_id)
+        key_alg = key_algorithm(public_key)
+        if algorithm is not None and algorithm != key_alg:
+            return False
+
+        data = create_canonical_payload(payload)
+        if merkle_proof is None:
+            verify_bytes(public_key, base64.b64decode(signature_b64), data, key_alg)
+            return True
+
+        root = merkle.root_from_proof(data, merkle.load_proof(merkle_proof))
+        cache_key = (key_id, root, signature_b64)
+        if _verified_roots.get(cache_key) is None:
+            verify_bytes(public_key, base64.b64decode(signature_b64), merkle.root_message(root), key_alg)
+            _verified_roots.set(cache_key, True)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,159 @@
+from flask import g
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, QueuePool
+from models import db
+import threading
+import time
+import os
+
+REPLICA_BIND = 'replica'
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+def normalize_database_url(url):
+    """SQLAlchemy only accepts postgresql://; Render and Heroku hand out postgres://"""
+    if url and url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+class PoolStats:
+    """Counters for one connection pool; read by pool_stats()"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds, outcome='checkouts'):
+        """Count a checkout attempt under 'checkouts', 'timeouts' or 'errors'"""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, 'timeouts')
+            raise
+        except Exception:
+            # Connect failures surface here too, when the pool opens a new connection
+            self.stats.record_wait(time.perf_counter() - start, 'errors')
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+def engine_options(url, read_only=False):
+    """Engine options for a database URL, tuned per scheme and overridable by env.
+
+    Postgres gets a sized, pre-pinged, recycled pool and a server-side
+    statement timeout. read_only (verify-only instances) shrinks the
+    default pool and makes every transaction read-only on the server. DB_PGBOUNCER=true switches to a PgBouncer
+    (transaction pooling) friendly setup: no client-side pool, since
+    PgBouncer already pools, and no startup options, which it rejects;
+    set statement_timeout on the database role instead. SQLite keeps
+    SQLAlchemy's defaults.
+
+    A request holds at most one connection per engine, so the default pool
+    is one connection per request thread (GUNICORN_THREADS) plus a small
+    overflow; see gunicorn.conf.py for the server-wide connection budget.
+    """
+    if not url or not url.startswith('postgresql'):
+        return {}
+
+    connect_args = {'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 10))}
+
+    if _env_bool('DB_PGBOUNCER', False):
+        return {'poolclass': NullPool, 'connect_args': connect_args}
+
+    options = []
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if statement_timeout:
+        options.append(f'-c statement_timeout={statement_timeout}')
+    if read_only:
+        options.append('-c default_transaction_read_only=on')
+    if options:
+        connect_args['options'] = ' '.join(options)
+
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 2 if read_only else os.getenv('GUNICORN_THREADS', 4))),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 2)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 300)),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True),
+        'connect_args': connect_args
+    }
+
+def configure_database(app, read_only=False):
+    """Set the primary URL, pool options and optional read replica bind on app.config"""
+    url = normalize_database_url(os.getenv('DATABASE_URL', 'sqlite:///psu_certificates.db'))
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url, read_only)
+
+    replica_url = normalize_database_url(os.getenv('DATABASE_REPLICA_URL'))
+    if replica_url:
+        app.config['SQLALCHEMY_BINDS'] = {
+            REPLICA_BIND: dict(engine_options(replica_url, read_only), url=replica_url)
+        }
+
+    @app.teardown_appcontext
+    def close_read_session(exc):
+        session = g.pop('_read_session', None)
+        if session is not None:
+            session.close()
+
+def replica_enabled():
+    return REPLICA_BIND in db.engines
+
+def read_session():
+    """Session for read-only endpoints: the read replica when one is configured.
+
+    Replicas lag; callers that must see a just-committed row (e.g. a
+    verify right after issuance) should fall back to db.session on a miss.
+    """
+    if not replica_enabled():
+        return db.session
+    session = g.get('_read_session')
+    if session is None:
+        session = g._read_session = Session(bind=db.engines[REPLICA_BIND])
+    return session
+
+def pool_stats():
+    """Pool usage for every configured engine, keyed by bind name"""
+    stats = {}
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        entry = {'pool': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': pool.overflow()
+            })
+        counters = getattr(pool, 'stats', None)
+        if counters is not None:
+            entry.update({
+                'checkouts': counters.checkouts,
+                'timeouts': counters.timeouts,
+                'errors': counters.errors,
+                'wait_seconds_total': round(counters.wait_seconds_total, 6),
+                'wait_seconds_max': round(counters.wait_seconds_max, 6)
+            })
+        stats[bind_key or 'primary'] = entry
+    return stats
@@ -0,0 +1,58 @@
+from utils.crypto import build_certificate_payload
+import csv
+import io
+import json
+
+BASE_FIELDS = ['uuid', 'student_name', 'student_id', 'degree', 'program',
+               'issue_date', 'issuer', 'revoked', 'created_at']
+SIGNATURE_FIELDS = ['signature', 'key_id', 'signature_algorithm', 'merkle_proof']
+REVOCATION_FIELDS = ['revoked_reason']
+
+def export_fields(include_signature=False, include_revocation=False):
+    """Column list for an export, in output order"""
+    fields = list(BASE_FIELDS)
+    if include_signature:
+        fields += SIGNATURE_FIELDS
+    if include_revocation:
+        fields += REVOCATION_FIELDS
+    return fields
+
+def export_record(row, fields):
+    """Flatten a certificate/student row into an export record.
+
+    The payload fields match build_certificate_payload exactly, so together
+    with the signature each record can be re-verified offline.
+    """
+    record = build_certificate_payload(row, row)
+    record['revoked'] = bool(row.revoked)
+    record['created_at'] = row.created_at.isoformat() if row.created_at else None
+    if 'signature' in fields:
+        record['signature'] = row.signature
+        record['key_id'] = row.key_id
+        record['signature_algorithm'] = row.signature_algorithm
+        record['merkle_proof'] = row.merkle_proof
+    if 'revoked_reason' in fields:
+        record['revoked_reason'] = row.revoked_reason
+    return record
+
+def iter_ndjson(rows, fields):
+    """Yield one JSON document per line"""
+    for row in rows:
+        yield json.dumps(export_record(row, fields), separators=(',', ':')) + '\n'
+
+def iter_csv(rows, fields):
+    """Yield a CSV header followed by one line per row"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+
+    writer.writeheader()
+    yield _drain(buffer)
+    for row in rows:
+        writer.writerow(export_record(row, fields))
+        yield _drain(buffer)
+
+def _drain(buffer):
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return value
@@ -0,0 +1,35 @@
+import os
+
+# Cache policies for public, unauthenticated responses. Everything else
+# gets `no-cache, no-store, must-revalidate` from the app's after_request,
+# which leaves responses marked public alone.
+#
+# Verification verdicts can change (revocation), so browsers and CDNs keep
+# them briefly and revalidate with If-None-Match; stale-while-revalidate
+# lets a CDN keep answering repeat QR scans while it refetches. A revoked
+# certificate's verdict gets a new ETag, so it is seen at the latest
+# max-age + stale-while-revalidate seconds after the revocation.
+
+VERIFY_MAX_AGE = int(os.getenv('VERIFY_CACHE_MAX_AGE', 60))
+VERIFY_STALE_WHILE_REVALIDATE = int(os.getenv('VERIFY_CACHE_SWR', 300))
+
+# Certificate PDFs are content-addressed (the ETag is their content hash).
+# Revoked certificates' PDFs get a different ETag and are not cached publicly.
+DOWNLOAD_MAX_AGE = int(os.getenv('DOWNLOAD_CACHE_MAX_AGE', 3600))
+DOWNLOAD_STALE_WHILE_REVALIDATE = int(os.getenv('DOWNLOAD_CACHE_SWR', 86400))
+
+def public_cache_control(max_age, stale_while_revalidate=0):
+    """Cache-Control value for a publicly cacheable response"""
+    value = f'public, max-age={max_age}'
+    if stale_while_revalidate:
+        value += f', stale-while-revalidate={stale_while_revalidate}'
+    return value
+
+def cache_publicly(response, max_age, stale_while_revalidate=0):
+    """Let browsers and shared caches keep a response for max_age seconds"""
+    response.headers['Cache-Control'] = public_cache_control(max_age, stale_while_revalidate)
+    return response
+
+def download_etag(pdf_key, revoked):
+    """ETag of a certificate PDF download: its content hash, marked once revoked"""
+    return f'{pdf_key}-revoked' if revoked else pdf_key
@@ -0,0 +1,299 @@
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from models import db, Certificate, Student
+from utils.crypto import (
+    RSA_PSS_SHA256, build_certificate_payload, key_id_for, key_manager, sign_payload,
+    sign_payloads_merkle
+)
+from utils.render_queue import render_inline_enabled
+import csv
+import io
+import os
+import uuid as uuid_lib
+
+VERIFY_URL_TEMPLATE = "https://psu-certificate-verification-live.vercel.app/verify/{uuid}"
+
+# What the certificate QR code carries: 'url' (the verification URL) or
+# 'token' (a signed offline token, see utils.qr_token)
+QR_PAYLOAD = os.getenv('QR_PAYLOAD', 'url')
+
+REQUIRED_FIELDS = ('first_name', 'last_name', 'student_id', 'degree', 'program', 'issue_date')
+
+DEFAULT_CHUNK_SIZE = int(os.getenv('BULK_ISSUE_CHUNK_SIZE', 500))
+# Unset: a process pool only when there is CPU-heavy work to fan out (see
+# default_workers); otherwise pool startup costs far more than it saves
+DEFAULT_WORKERS = int(os.environ['BULK_ISSUE_WORKERS']) if os.getenv('BULK_ISSUE_WORKERS') else None
+
+# 'individual' signs each certificate; 'merkle' signs one Merkle root per chunk
+SIGNING_MODES = ('individual', 'merkle')
+DEFAULT_SIGNING = os.getenv('BULK_ISSUE_SIGNING', 'individual')
+
+def verification_url(certificate_uuid):
+    """Public verification URL encoded in a certificate's QR code"""
+    return VERIFY_URL_TEMPLATE.format(uuid=certificate_uuid)
+
+def parse_graduates_csv(text):
+    """Parse a CSV of graduates (header row required) into dicts"""
+    reader = csv.DictReader(io.StringIO(text))
+    return [{k.strip(): (v or '').strip() for k, v in row.items() if k} for row in reader]
+
+# Maximum lengths of the Student/Certificate columns each field is stored in
+FIELD_MAX_LENGTHS = {
+    'first_name': 100, 'last_name': 100, 'student_id': 50, 'email': 120,
+    'degree': 200, 'program': 200, 'issue_date': 10
+}
+
+def clean_graduate(record):
+    """Return (record, None) with fields coerced to stripped strings, or (None, error)"""
+    if not isinstance(record, dict):
+        return None, 'Row must be an object'
+    cleaned = {}
+    for field, max_length in FIELD_MAX_LENGTHS.items():
+        value = record.get(field)
+        if value is None:
+            continue
+        # Numeric student IDs are common in spreadsheets exported as JSON
+        if field == 'student_id' and isinstance(value, int) and not isinstance(value, bool):
+            value = str(value)
+        if not isinstance(value, str):
+            return None, f'{field} must be a string'
+        value = value.strip()
+        if len(value) > max_length:
+            return None, f'{field} must be at most {max_length} characters'
+        if value:
+            cleaned[field] = value
+    missing = [field for field in REQUIRED_FIELDS if field not in cleaned]
+    if missing:
+        return None, f"Missing field(s): {', '.join(missing)}"
+    try:
+        datetime.strptime(cleaned['issue_date'], '%Y-%m-%d')
+    except ValueError:
+        return None, 'issue_date must be YYYY-MM-DD'
+    return cleaned, None
+
+def qr_content(certificate, student):
+    """Text encoded in a certificate's QR code"""
+    # A token holds a plain signature; Merkle-signed certificates keep the URL
+    if QR_PAYLOAD == 'token' and not getattr(certificate, 'merkle_proof', None):
+        from utils.qr_token import encode_token
+
+        # Certificates from before key IDs were signed by the active key
+        key_id = certificate.key_id or key_id_for(key_manager.public_key())
+        return encode_token(certificate, student, key_id)
+    return verification_url(certificate.uuid)
+
+def certificate_pdf_key(certificate, student):
+    """Content-addressed PDF cache key for a certificate"""
+    from utils.pdf_cache import TEMPLATE_VERSION, pdf_cache_key
+
+    payload = build_certificate_payload(certificate, student)
+    if QR_PAYLOAD == 'token' and not getattr(certificate, 'merkle_proof', None):
+        from utils.qr_token import TOKEN_VERSION
+        qr_template = f'token:{TOKEN_VERSION}'
+    else:
+        qr_template = VERIFY_URL_TEMPLATE
+    return pdf_cache_key(payload, TEMPLATE_VERSION, qr_template)
+
+def render_certificate_files(certificate, student):
+    """Render a certificate's PDF into the PDF cache unless already there.
+
+    Returns the storage object key of the PDF.
+    """
+    from utils.pdf_cache import pdf_cache
+    from utils.pdf_generator import generate_certificate_pdf
+    from utils.qr_generator import generate_qr_code
+
+    key = certificate_pdf_key(certificate, student)
+    if pdf_cache.contains(key):
+        return pdf_cache.object_key(key)
+    qr_code = generate_qr_code(qr_content(certificate, student))
+    return pdf_cache.put(key, generate_certificate_pdf(certificate, student, qr_code))
+
+def sign_and_render(job):
+    """Sign one certificate and, if job['render'] is set, render its files.
+
+    Runs in a worker process, so it takes and returns plain data only. A
+    job that arrives with job['signed'] (Merkle signing) is not re-signed.
+    """
+    certificate = SimpleNamespace(**job['certificate'])
+    student = SimpleNamespace(**job['student'])
+
+    signed = job.get('signed') or dict(sign_payload(build_certificate_payload(certificate, student)),
+                                       merkle_proof=None)
+    certificate.signature = signed['signature']
+    certificate.key_id = signed['key_id']
+    certificate.merkle_proof = signed['merkle_proof']
+    pdf_path = render_certificate_files(certificate, student) if job['render'] else None
+
+    return dict(signed, uuid=certificate.uuid, pdf_path=pdf_path)
+
+def default_workers(signing):
+    """Pool size when none is given: the CPU count for inline PDF rendering
+    or individual RSA signatures on a multi-core host, else 0 (Ed25519 and
+    ECDSA signatures and Merkle roots cost less than starting a pool and
+    shipping jobs to it)"""
+    if DEFAULT_WORKERS is not None:
+        return DEFAULT_WORKERS
+    cpus = os.cpu_count() or 1
+    if cpus < 2:
+        return 0
+    if render_inline_enabled():
+        return cpus
+    if signing == 'individual' and key_manager.signing_key()[1] == RSA_PSS_SHA256:
+        return cpus
+    return 0
+
+def _init_issue_worker():
+    """Process pool initializer: load the signing key in the fresh worker process"""
+    from utils.crypto import reload_keys
+    reload_keys()
+    key_manager.signing_key()
+
+def issue_certificates_bulk(records, chunk_size=None, workers=None, signing=None):
+    """Issue certificates for many graduates at once.
+
+    Records are processed in chunks. Each chunk does one student lookup,
+    one bulk student insert and one bulk certificate insert, and is then
+    committed. Signing (and rendering, in inline render mode) is fanned
+    out to a process pool of `workers` processes (default: default_workers);
+    workers=0 keeps everything in the current process. In queue mode certificates are left pending for the render
+    workers. With signing='merkle' each chunk is one cohort: its root is
+    signed once here and each certificate stores its inclusion proof.
+
+    Returns one result dict per input record, in input order.
+    """
+    chunk_size = DEFAULT_CHUNK_SIZE if chunk_size is None else chunk_size
+    signing = signing or DEFAULT_SIGNING
+    if signing not in SIGNING_MODES:
+        raise ValueError(f"signing must be one of: {', '.join(SIGNING_MODES)}")
+    workers = default_workers(signing) if workers is None else workers
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError('chunk_size must be an integer of at least 1')
+    if not isinstance(workers, int) or workers < 0:
+        raise ValueError('workers must be an integer of at least 0')
+    results = [None] * len(records)
+
+    executor = None
+    if workers > 0:
+        # Imported here: multiprocessing is only needed by bulk issuance.
+        # forkserver, not fork: gunicorn workers run threads, and a forked
+        # child could inherit a lock (logging, DB pool, OpenSSL) held by one
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'),
+                                       initializer=_init_issue_worker)
+    try:
+        for start in range(0, len(records), chunk_size):
+            chunk = list(enumerate(records[start:start + chunk_size], start=start))
+            _issue_chunk(chunk, results, executor, signing)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return results
+
+def _issue_chunk(chunk, results, executor, signing):
+    valid = []
+    for index, record in chunk:
+        record, error = clean_graduate(record)
+        if error:
+            results[index] = {'row': index, 'status': 'error', 'error': error}
+        else:
+            valid.append((index, record))
+    if not valid:
+        return
+
+    # A failure rolls back this chunk only; earlier chunks stay committed
+    # and every row still gets a result
+    for attempt in range(2):
+        try:
+            jobs = _insert_chunk(valid, executor, signing)
+            break
+        except IntegrityError as e:
+            db.session.rollback()
+            # Another request created some of the same students; the retry finds them
+            if attempt == 0:
+                continue
+            error = str(e.orig)
+        except Exception as e:
+            db.session.rollback()
+            error = str(e)
+        for index, _ in valid:
+            results[index] = {'row': index, 'status': 'error', 'error': error}
+        return
+
+    for (index, _), job in zip(valid, jobs):
+        results[index] = {'row': index, 'status': 'issued', 'uuid': job['certificate']['uuid']}
+
+def _insert_chunk(valid, executor, signing):
+    """Upsert students, sign (and render) and insert one chunk's certificates, then commit"""
+    students = _upsert_students([record for _, record in valid])
+    render = render_inline_enabled()
+
+    jobs = []
+    for index, record in valid:
+        student = students[record['student_id']]
+        jobs.append({
+            'certificate': {
+                'uuid': str(uuid_lib.uuid4()),
+                'degree': record['degree'],
+                'program': record['program'],
+                'issue_date': datetime.strptime(record['issue_date'], '%Y-%m-%d').date()
+            },
+            'student': {
+                'id': student.id,
+                'first_name': student.first_name,
+                'last_name': student.last_name,
+                'student_id': student.student_id
+            },
+            'render': render
+        })
+
+    if signing == 'merkle':
+        payloads = [build_certificate_payload(SimpleNamespace(**job['certificate']),
+                                              SimpleNamespace(**job['student'])) for job in jobs]
+        for job, signed in zip(jobs, sign_payloads_merkle(payloads)):
+            job['signed'] = signed
+
+    # With Merkle signing and no inline render there is nothing left to fan out
+    if executor is not None and (render or signing != 'merkle'):
+        rendered = list(executor.map(sign_and_render, jobs, chunksize=max(1, len(jobs) // 32)))
+    else:
+        rendered = [sign_and_render(job) for job in jobs]
+
+    rows = []
+    for job, output in zip(jobs, rendered):
+        rows.append(dict(job['certificate'], student_id=job['student']['id'],
+                         signature=output['signature'], key_id=output['key_id'],
+                         signature_algorithm=output['algorithm'], merkle_proof=output['merkle_proof'],
+                         pdf_path=output['pdf_path'],
+                         render_status='done' if render else 'pending'))
+    db.session.execute(insert(Certificate), rows)
+    db.session.commit()
+    return jobs
+
+def _upsert_students(records):
+    """Return {student_id: Student} for the records, creating missing students"""
+    student_ids = {record['student_id'] for record in records}
+    existing = Student.query.filter(Student.student_id.in_(student_ids)).all()
+    students = {student.student_id: student for student in existing}
+
+    new_students = []
+    for record in records:
+        if record['student_id'] in students:
+            continue
+        student = Student(
+            first_name=record['first_name'],
+            last_name=record['last_name'],
+            student_id=record['student_id'],
+            email=record.get('email') or None
+        )
+        students[student.student_id] = student
+        new_students.append(student)
+
+    if new_students:
+        db.session.add_all(new_students)
+        db.session.flush()
+    return students
@@ -0,0 +1,72 @@
+from flask.json.provider import DefaultJSONProvider
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+import dataclasses
+import os
+
+# orjson (default) or stdlib; both emit dates and datetimes as ISO 8601,
+# so routes can put them in responses as they come from the database
+JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+
+def _default(obj):
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """Flask's stdlib provider, but with ISO 8601 dates instead of HTTP dates"""
+
+    default = staticmethod(_default)
+    sort_keys = False
+
+class OrjsonProvider(IsoJSONProvider):
+    """JSON provider backed by orjson: several times faster on large listings.
+
+    Writes the response body as bytes straight from orjson. Keys keep their
+    insertion order; debug mode pretty-prints with two-space indentation.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        import orjson
+        self._orjson = orjson
+
+    def _option(self, indent=False):
+        option = self._orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= self._orjson.OPT_SORT_KEYS
+        if indent:
+            option |= self._orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return self._orjson.dumps(obj, default=_default,
+                                  option=self._option(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = self._orjson.dumps(obj, default=_default, option=self._option(indent))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def configure_json(app):
+    """Install the JSON provider selected by JSON_PROVIDER on the app"""
+    if JSON_PROVIDER == 'stdlib':
+        app.json = IsoJSONProvider(app)
+        return
+    if JSON_PROVIDER != 'orjson':
+        raise ValueError('JSON_PROVIDER must be orjson or stdlib')
+    try:
+        app.json = OrjsonProvider(app)
+    except ImportError:
+        raise RuntimeError("JSON_PROVIDER=orjson requires orjson (pip install orjson)")
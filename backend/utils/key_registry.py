@@ -0,0 +1,54 @@
+from models import db, Certificate, Issuer
+from utils.crypto import (
+    ISSUER_NAME, key_manager, key_algorithm, key_id_for,
+    _parse_public_key
+)
+
+def issuer_public_key_pem(key_id):
+    """Resolver for KeyManager: public key PEM of a registered key ID"""
+    issuer = Issuer.query.filter_by(key_id=key_id).first()
+    return issuer.public_key_pem.encode('utf-8') if issuer else None
+
+# Verification of certificates signed by rotated-out keys looks them up here
+key_manager.resolver = issuer_public_key_pem
+
+def register_key(public_key_pem, private_key_reference, active=True):
+    """Add a public key to the Issuer registry (idempotent) and return its row.
+
+    Registering a key as active marks every other key inactive; inactive
+    keys stay in the registry so their certificates keep verifying.
+    """
+    if isinstance(public_key_pem, bytes):
+        public_key_pem = public_key_pem.decode('utf-8')
+    public_key = _parse_public_key(public_key_pem.encode('utf-8'))
+    key_id = key_id_for(public_key)
+
+    backfill_issuer_key_ids()
+    issuer = Issuer.query.filter_by(key_id=key_id).first()
+    if issuer is None:
+        issuer = Issuer(name=ISSUER_NAME, public_key_pem=public_key_pem, key_id=key_id)
+        db.session.add(issuer)
+    issuer.algorithm = key_algorithm(public_key)
+    issuer.private_key_reference = private_key_reference
+    issuer.active = active
+
+    if active:
+        Issuer.query.filter(Issuer.key_id != key_id).update({'active': False})
+    db.session.flush()
+    return issuer
+
+def backfill_issuer_key_ids():
+    """Fill key_id/algorithm on Issuer rows created before key IDs existed"""
+    for issuer in Issuer.query.filter(Issuer.key_id.is_(None)).all():
+        public_key = _parse_public_key(issuer.public_key_pem.encode('utf-8'))
+        issuer.key_id = key_id_for(public_key)
+        issuer.algorithm = key_algorithm(public_key)
+
+def assign_legacy_certificates(key_id, algorithm):
+    """Record the signing key on certificates issued before key IDs existed.
+
+    Must run before the active key is replaced: until then, certificates
+    without a key ID are verified against the active key.
+    """
+    return Certificate.query.filter(Certificate.key_id.is_(None)) \
+        .update({'key_id': key_id, 'signature_algorithm': algorithm}, synchronize_session=False)
@@ -0,0 +1,62 @@
+import hashlib
+import json
+
+# Binary SHA-256 Merkle tree over certificate payloads. Leaves and inner
+# nodes are domain-separated (0x00 / 0x01 prefixes) so a leaf can never be
+# passed off as an inner node. An odd node at the end of a level is
+# promoted unchanged to the next level.
+#
+# An inclusion proof is the list of sibling hashes from leaf to root, each
+# tagged with the side it sits on: "L<hex>" or "R<hex>".
+
+def leaf_hash(data):
+    return hashlib.sha256(b'\x00' + data).digest()
+
+def node_hash(left, right):
+    return hashlib.sha256(b'\x01' + left + right).digest()
+
+def build_tree(leaves):
+    """Return (root, proofs) for a list of leaf byte strings"""
+    if not leaves:
+        raise ValueError('Cannot build a Merkle tree without leaves')
+
+    level = [leaf_hash(leaf) for leaf in leaves]
+    # positions[i] is the index of leaf i's ancestor in the current level
+    positions = list(range(len(leaves)))
+    proofs = [[] for _ in leaves]
+
+    while len(level) > 1:
+        for leaf_index, position in enumerate(positions):
+            sibling = position ^ 1
+            if sibling < len(level):
+                side = 'L' if sibling < position else 'R'
+                proofs[leaf_index].append(side + level[sibling].hex())
+            positions[leaf_index] = position // 2
+
+        level = [node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+
+    return level[0], proofs
+
+def root_from_proof(leaf, proof):
+    """Recompute the root a leaf and its inclusion proof lead to"""
+    node = leaf_hash(leaf)
+    for step in proof:
+        sibling = bytes.fromhex(step[1:])
+        if len(sibling) != 32 or step[0] not in 'LR':
+            raise ValueError('Malformed Merkle proof step')
+        node = node_hash(sibling, node) if step[0] == 'L' else node_hash(node, sibling)
+    return node
+
+def root_message(root):
+    """Bytes actually signed for a Merkle root"""
+    return b'psu-certificate-merkle-root:v1:' + root
+
+def dump_proof(proof):
+    return json.dumps(proof, separators=(',', ':'))
+
+def load_proof(text):
+    proof = json.loads(text)
+    if not isinstance(proof, list) or not all(isinstance(step, str) and step for step in proof):
+        raise ValueError('Malformed Merkle proof')
+    return proof
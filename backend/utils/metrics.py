@@ -0,0 +1,321 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+import functools
+import json
+import random
+import threading
+import time
+import os
+
+# Minimal Prometheus instrumentation: counters and histograms kept in
+# process memory and rendered in the text exposition format at /metrics.
+#
+# Request latency and counts are always recorded. DB query timing and the
+# timed() function hooks only run for sampled requests (METRICS_SAMPLE_RATE,
+# default 1.0); outside a request (CLI scripts, background threads) they
+# always run.
+#
+# Under gunicorn every worker has its own registry. With METRICS_DIR set,
+# a background thread in each worker writes its snapshot there every
+# METRICS_FLUSH_INTERVAL seconds while it has new data, and /metrics sums
+# all snapshots, so a scrape that lands on any
+# worker sees the whole server. The gunicorn hooks fold the snapshot of an
+# exited worker into an archive file so counters never go backwards.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', 1.0))
+METRICS_DIR = os.getenv('METRICS_DIR')
+FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
+ARCHIVE_FILE = 'archive.json'
+
+_sampled = ContextVar('metrics_sampled', default=True)
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def state(self):
+        with self._lock:
+            return {labels: value for labels, value in self._values.items()}
+
+    @staticmethod
+    def merge(a, b):
+        return a + b
+
+    def render(self, state):
+        lines = []
+        for labels, value in sorted(state.items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+class Histogram:
+    """Histogram with fixed buckets; state per label set is [bucket counts..., sum, count]"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def state(self):
+        with self._lock:
+            return {labels: list(entry) for labels, entry in self._values.items()}
+
+    @staticmethod
+    def merge(a, b):
+        return [x + y for x, y in zip(a, b)]
+
+    def render(self, state):
+        lines = []
+        for labels, entry in sorted(state.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry):
+                cumulative += count
+                le = (('le', _format_value(float(bound))),)
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}')
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(entry[-2])}')
+            lines.append(f'{self.name}_count{label_text} {entry[-1]}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self._dirty = False
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def state(self):
+        return {metric.name: metric.state() for metric in self.metrics}
+
+    def render(self):
+        """Text exposition of this process, or of every worker when METRICS_DIR is set"""
+        state = self.state()
+        if METRICS_DIR:
+            self.flush()
+            state = self._merge_snapshots()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render(state.get(metric.name, {})))
+        return '\n'.join(lines) + '\n'
+
+    # ----------------------------------------
+    # Multi-process snapshots (METRICS_DIR)
+    # ----------------------------------------
+    def mark_dirty(self):
+        """Note new data; starts this process's flusher thread on first use"""
+        if not METRICS_DIR:
+            return
+        self._dirty = True
+        if self._flusher_pid != os.getpid():
+            with self._flusher_lock:
+                # Threads do not survive fork, so each worker starts its own
+                if self._flusher_pid != os.getpid():
+                    self._flusher_pid = os.getpid()
+                    threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            if self._dirty:
+                self._dirty = False
+                try:
+                    self.flush()
+                except OSError as e:
+                    print(f"Metrics flush error: {e}")
+
+    def flush(self):
+        """Write this process's snapshot to METRICS_DIR"""
+        if not METRICS_DIR:
+            return
+        snapshot = {name: [[list(labels), value] for labels, value in values.items()]
+                    for name, values in self.state().items()}
+        _write_json(os.path.join(METRICS_DIR, f'worker-{os.getpid()}.json'), snapshot)
+
+    def _merge_snapshots(self):
+        merged = {}
+        for name in os.listdir(METRICS_DIR):
+            if name.endswith('.json'):
+                self._merge_into(merged, _read_json(os.path.join(METRICS_DIR, name)))
+        return merged
+
+    def _merge_into(self, merged, snapshot):
+        kinds = {metric.name: metric for metric in self.metrics}
+        for name, values in snapshot.items():
+            metric = kinds.get(name)
+            if metric is None:
+                continue
+            target = merged.setdefault(name, {})
+            for labels, value in values:
+                labels = tuple(labels)
+                target[labels] = metric.merge(target[labels], value) if labels in target else value
+
+    def clear_snapshots(self):
+        """Remove all snapshots; the gunicorn master calls this at startup"""
+        for name in os.listdir(METRICS_DIR):
+            if name.endswith('.json'):
+                os.remove(os.path.join(METRICS_DIR, name))
+
+    def fold_worker(self, pid):
+        """Add an exited worker's snapshot to the archive and remove it"""
+        path = os.path.join(METRICS_DIR, f'worker-{pid}.json')
+        if not os.path.exists(path):
+            return
+        archive_path = os.path.join(METRICS_DIR, ARCHIVE_FILE)
+        merged = {}
+        if os.path.exists(archive_path):
+            self._merge_into(merged, _read_json(archive_path))
+        self._merge_into(merged, _read_json(path))
+        _write_json(archive_path, {name: [[list(labels), value] for labels, value in values.items()]
+                                   for name, values in merged.items()})
+        os.remove(path)
+
+def _write_json(path, data):
+    tmp = f'{path}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # A worker replaced or removed it mid-read; skip this snapshot
+        return {}
+
+registry = Registry()
+
+REQUEST_COUNT = registry.register(Counter(
+    'psu_http_requests_total', 'HTTP requests by endpoint, method and status',
+    ('endpoint', 'method', 'status')))
+REQUEST_SECONDS = registry.register(Histogram(
+    'psu_http_request_duration_seconds', 'HTTP request latency by endpoint',
+    ('endpoint', 'method')))
+REQUEST_DB_QUERIES = registry.register(Histogram(
+    'psu_http_request_db_queries', 'DB queries per sampled request by endpoint',
+    ('endpoint',), buckets=COUNT_BUCKETS))
+REQUEST_DB_SECONDS = registry.register(Histogram(
+    'psu_http_request_db_seconds', 'Time in DB queries per sampled request by endpoint',
+    ('endpoint',)))
+DB_QUERY_SECONDS = registry.register(Histogram(
+    'psu_db_query_duration_seconds', 'DB statement execution time (sampled)'))
+FUNCTION_SECONDS = registry.register(Histogram(
+    'psu_function_duration_seconds', 'Time in signing, verification, QR and PDF code (sampled)',
+    ('function',)))
+
+def timed(name):
+    """Record the decorated function's duration under psu_function_duration_seconds{function=name}"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sampled.get():
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                FUNCTION_SECONDS.observe(time.perf_counter() - start, name)
+        return wrapper
+    return decorator
+
+# --------------------------------------------
+# Flask and SQLAlchemy hooks
+# --------------------------------------------
+def start_request():
+    """before_request hook: start the clock and decide whether to sample"""
+    from flask import g
+
+    g._metrics_start = time.perf_counter()
+    sampled = SAMPLE_RATE >= 1.0 or random.random() < SAMPLE_RATE
+    _sampled.set(sampled)
+    if sampled:
+        g._metrics_db = [0, 0.0]
+
+def finish_request(response):
+    """after_request hook: record latency, status and the request's DB usage"""
+    from flask import g, request
+
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return
+    endpoint = request.endpoint or 'unmatched'
+    REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint, request.method)
+    REQUEST_COUNT.inc(endpoint, request.method, str(response.status_code))
+
+    db_usage = g.pop('_metrics_db', None)
+    if db_usage is not None:
+        REQUEST_DB_QUERIES.observe(db_usage[0], endpoint)
+        REQUEST_DB_SECONDS.observe(db_usage[1], endpoint)
+    registry.mark_dirty()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sampled.get():
+        context._metrics_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_start', None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    DB_QUERY_SECONDS.observe(elapsed)
+
+    from flask import g, has_app_context
+    if has_app_context():
+        db_usage = g.get('_metrics_db')
+        if db_usage is not None:
+            db_usage[0] += 1
+            db_usage[1] += elapsed
+
+def instrument_sqlalchemy():
+    """Time every statement on every engine (primary and replica)"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,134 @@
+from utils.crypto import create_canonical_payload
+from utils.storage import LocalStorage, storage
+import hashlib
+import threading
+import time
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on Windows; single-process development only
+    fcntl = None
+
+# Revision of the certificate layout in utils/pdf_generator.py; bump it
+# whenever the rendered output changes. Kept here, not next to the
+# template, so computing a cache key never imports ReportLab.
+TEMPLATE_VERSION = 1
+
+def pdf_cache_key(payload, template_version, qr_template):
+    """Content address of a rendered certificate.
+
+    Rendering is deterministic, so the PDF is fully determined by the
+    signed payload, the template revision and what the QR encodes (the
+    verification URL template, or the token format).
+    """
+    digest = hashlib.sha256()
+    digest.update(create_canonical_payload(payload))
+    digest.update(f"|{template_version}|{qr_template}".encode('utf-8'))
+    return digest.hexdigest()
+
+class PdfCache:
+    """Size-bounded, content-addressed set of rendered PDFs with LRU eviction.
+
+    Objects are stored as <key>.pdf in a storage backend (utils.storage).
+    Hits touch the object, so its mtime is its last use in any process.
+    Eviction is a sweep over the whole directory rather than a per-process
+    index: after a put, at most once per sweep_interval seconds, a
+    background thread takes a file lock in the storage root (other
+    processes skip the sweep while it is held), lists every object and
+    deletes the least recently used until the total fits max_bytes.
+
+    A sweep can still delete a PDF between contains() and sending it;
+    callers treat a missing file at send time as a miss and render again.
+
+    Only local storage is swept. For shared backends such as S3, max_bytes
+    is 0 and the bucket is bounded with a lifecycle rule instead.
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    LOCK_NAME = '.pdf-cache.lock'
+
+    def __init__(self, storage, max_bytes=DEFAULT_MAX_BYTES, sweep_interval=60):
+        self.storage = storage
+        self.max_bytes = max_bytes if isinstance(storage, LocalStorage) else 0
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._sweeping = False
+        self._last_sweep = None
+
+    @classmethod
+    def from_env(cls, storage):
+        return cls(storage,
+                   max_bytes=int(os.getenv('PDF_CACHE_MAX_BYTES', cls.DEFAULT_MAX_BYTES)),
+                   sweep_interval=float(os.getenv('PDF_CACHE_SWEEP_SECONDS', 60)))
+
+    @staticmethod
+    def object_key(key):
+        return f'{key}.pdf'
+
+    def contains(self, key):
+        """Return True if a PDF for key is stored, marking it recently used"""
+        object_key = self.object_key(key)
+        if not self.storage.exists(object_key):
+            return False
+        self.storage.touch(object_key)
+        return True
+
+    def put(self, key, data):
+        """Store rendered bytes under key and return the storage object key"""
+        object_key = self.object_key(key)
+        self.storage.put(object_key, data, content_type='application/pdf')
+        if self.max_bytes:
+            self._schedule_sweep()
+        return object_key
+
+    def sweep(self):
+        """Evict least recently used PDFs until the total fits max_bytes.
+
+        Returns the number of PDFs deleted, or None if another process holds
+        the sweep lock.
+        """
+        os.makedirs(self.storage.root, exist_ok=True)
+        with open(os.path.join(self.storage.root, self.LOCK_NAME), 'a') as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None
+            entries = sorted(
+                (mtime, object_key, size)
+                for object_key, size, mtime in self.storage.iter_objects()
+                if object_key.endswith('.pdf')
+            )
+            total = sum(size for _, _, size in entries)
+            deleted = 0
+            # Never delete the newest PDF, which was usually just stored
+            for _, object_key, size in entries[:-1]:
+                if total <= self.max_bytes:
+                    break
+                self.storage.delete(object_key)
+                total -= size
+                deleted += 1
+            return deleted
+
+    def _schedule_sweep(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._sweeping or (self._last_sweep is not None
+                                  and now - self._last_sweep < self.sweep_interval):
+                return
+            self._sweeping = True
+            self._last_sweep = now
+        threading.Thread(target=self._run_sweep, name='pdf-cache-sweep', daemon=True).start()
+
+    def _run_sweep(self):
+        try:
+            self.sweep()
+        except Exception as e:
+            print(f"PDF cache sweep error: {e}")
+        finally:
+            with self._lock:
+                self._sweeping = False
+
+pdf_cache = PdfCache.from_env(storage)
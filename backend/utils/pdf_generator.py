@@ -1,135 +1,159 @@
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab import rl_config
+from utils.metrics import timed
+import threading
+import io
 import os
 from datetime import datetime
 
-def generate_certificate_pdf(certificate, student, qr_path):
-    """Generate PDF certificate"""
-    # Ensure certificates directory exists
-    os.makedirs('certificates', exist_ok=True)
-    
-    pdf_path = os.path.join('certificates', f'certificate_{certificate.uuid}.pdf')
-    
-    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-    story = []
-    
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Heading2'],
-        fontSize=18,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
-    
-    # Header
-    story.append(Paragraph("PUNTLAND STATE UNIVERSITY", title_style))
-    story.append(Paragraph("CERTIFICATE OF COMPLETION", subtitle_style))
-    story.append(Spacer(1, 20))
-    
-    # Certificate content
-    story.append(Paragraph("This is to certify that", body_style))
-    story.append(Spacer(1, 5))
-    
-    name_style = ParagraphStyle(
-        'StudentName',
-        parent=styles['Normal'],
-        fontSize=20,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue,
-        fontName='Helvetica-Bold'
-    )
-    
-    story.append(Paragraph(f"{student.first_name} {student.last_name}", name_style))
-    story.append(Spacer(1, 20))
-    
-    # Brief description of completion
-    completion_text = f"has successfully completed all required coursework and examinations for the {certificate.degree} program in {certificate.program}, demonstrating proficiency in the field and meeting all academic standards set forth by Puntland State University."
-    story.append(Paragraph(completion_text, body_style))
-    story.append(Spacer(1, 20))
-    
-    degree_style = ParagraphStyle(
-        'Degree',
-        parent=styles['Normal'],
-        fontSize=16,
-        spaceAfter=10,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue,
-        fontName='Helvetica-Bold'
-    )
-    
-    story.append(Paragraph(f"{certificate.degree}", degree_style))
-    story.append(Paragraph(f"in {certificate.program}", body_style))
-    story.append(Spacer(1, 40))
-    
-    # Signature section
-    signature_style = ParagraphStyle(
-        'Signature',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_CENTER,
-        spaceAfter=5
+# Bump utils.pdf_cache.TEMPLATE_VERSION whenever the rendered output changes
+
+# Page streams are already zlib-compressed; the extra ASCII85 pass only
+# costs time and ~25% size.
+rl_config.useA85 = 0
+
+class CertificateTemplate:
+    """Static parts of the certificate layout, built once per process.
+
+    Styles, the signature table style and the header are prepared here;
+    each render only lays out the per-certificate fields. The header is
+    drawn straight onto the page canvas from precomputed positions rather
+    than flowed as paragraphs. Nothing here is mutated while rendering,
+    so one instance is shared by all threads.
+    """
+
+    FRAME_PADDING = 6
+
+    # (text, font, size, baseline offset below the top of the frame)
+    HEADER_LINES = (
+        ("PUNTLAND STATE UNIVERSITY", 'Helvetica-Bold', 24, 24),
+        ("CERTIFICATE OF COMPLETION", 'Helvetica-Bold', 18, 70),
     )
-    
-    # Create signature table
-    signature_data = [[
+    HEADER_HEIGHT = 110
+
+    SIGNATURE_DATA = [[
         'Dr. Ahmed Hassan\nRegistrar',
         'Prof. Fatima Ali\nDean of Academic Affairs',
         'Dr. Mohamed Omar\nUniversity President'
     ]]
-    
-    signature_table = Table(signature_data, colWidths=[2*inch, 2*inch, 2*inch])
-    signature_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 20),
-        ('LINEABOVE', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    story.append(signature_table)
-    story.append(Spacer(1, 20))
-    
-    # Date and signature section
-    date_str = certificate.issue_date.strftime("%B %d, %Y")
-    story.append(Paragraph(f"Issued on: {date_str}", body_style))
-    story.append(Spacer(1, 20))
-    
-    # QR Code
-    if os.path.exists(qr_path):
-        story.append(Paragraph("Scan QR code to verify:", body_style))
-        story.append(Spacer(1, 10))
-        qr_img = Image(qr_path, width=1.5*inch, height=1.5*inch)
-        qr_img.hAlign = 'CENTER'
-        story.append(qr_img)
-        story.append(Spacer(1, 10))
-    
-    story.append(Paragraph(f"Certificate ID: {certificate.uuid}", body_style))
-    
-    doc.build(story)
-    return pdf_path
\ No newline at end of file
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+
+        self.body_style = ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=12,
+            spaceAfter=12,
+            alignment=TA_CENTER
+        )
+
+        self.name_style = ParagraphStyle(
+            'StudentName',
+            parent=styles['Normal'],
+            fontSize=20,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue,
+            fontName='Helvetica-Bold'
+        )
+
+        self.degree_style = ParagraphStyle(
+            'Degree',
+            parent=styles['Normal'],
+            fontSize=16,
+            spaceAfter=10,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue,
+            fontName='Helvetica-Bold'
+        )
+
+        self.signature_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 20),
+            ('LINEABOVE', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+    def draw_header(self, canvas, doc):
+        """onFirstPage hook: draw the static header"""
+        top = doc.pagesize[1] - doc.topMargin - self.FRAME_PADDING
+        center = doc.leftMargin + doc.width / 2
+
+        canvas.saveState()
+        canvas.setFillColor(colors.darkblue)
+        for text, font, size, offset in self.HEADER_LINES:
+            canvas.setFont(font, size)
+            canvas.drawCentredString(center, top - offset, text)
+        canvas.restoreState()
+
+    def build_story(self, certificate, student, qr_code=None):
+        """Lay out the per-certificate content below the header"""
+        body_style = self.body_style
+        story = [Spacer(1, self.HEADER_HEIGHT)]
+
+        story.append(Paragraph("This is to certify that", body_style))
+        story.append(Spacer(1, 5))
+        story.append(Paragraph(f"{student.first_name} {student.last_name}", self.name_style))
+        story.append(Spacer(1, 20))
+
+        # Brief description of completion
+        completion_text = f"has successfully completed all required coursework and examinations for the {certificate.degree} program in {certificate.program}, demonstrating proficiency in the field and meeting all academic standards set forth by Puntland State University."
+        story.append(Paragraph(completion_text, body_style))
+        story.append(Spacer(1, 20))
+
+        story.append(Paragraph(f"{certificate.degree}", self.degree_style))
+        story.append(Paragraph(f"in {certificate.program}", body_style))
+        story.append(Spacer(1, 40))
+
+        # Signature section
+        signature_table = Table(self.SIGNATURE_DATA, colWidths=[2*inch, 2*inch, 2*inch])
+        signature_table.setStyle(self.signature_table_style)
+        story.append(signature_table)
+        story.append(Spacer(1, 20))
+
+        date_str = certificate.issue_date.strftime("%B %d, %Y")
+        story.append(Paragraph(f"Issued on: {date_str}", body_style))
+        story.append(Spacer(1, 20))
+
+        # QR Code
+        if qr_code is not None:
+            story.append(Paragraph("Scan QR code to verify:", body_style))
+            story.append(Spacer(1, 10))
+            story.append(qr_code)
+            story.append(Spacer(1, 10))
+
+        story.append(Paragraph(f"Certificate ID: {certificate.uuid}", body_style))
+        return story
+
+_template = None
+_template_lock = threading.Lock()
+
+def get_template():
+    """Return the process-wide CertificateTemplate, building it on first use"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = CertificateTemplate()
+    return _template
+
+@timed('generate_certificate_pdf')
+def generate_certificate_pdf(certificate, student, qr_code=None):
+    """Generate PDF certificate bytes, embedding the QR drawing from generate_qr_code.
+
+    Output is deterministic (invariant mode: no timestamps or random IDs),
+    so the same certificate always renders to the same bytes.
+    """
+    buffer = io.BytesIO()
+
+    template = get_template()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+    doc.build(template.build_story(certificate, student, qr_code), onFirstPage=template.draw_header)
+    return buffer.getvalue()
@@ -1,24 +1,59 @@
 import qrcode
-from PIL import Image
-import os
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable
+from utils.metrics import timed
 
-def generate_qr_code(url, certificate_uuid):
-    """Generate QR code for certificate verification URL"""
+class QRCodeFlowable(Flowable):
+    """Draws a QR module matrix as a single vector path on the PDF canvas"""
+
+    def __init__(self, matrix, size=1.5*inch):
+        super().__init__()
+        self.matrix = matrix
+        self.size = size
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.size, self.size
+
+    def draw(self):
+        count = len(self.matrix)
+        path = self.canv.beginPath()
+        for row_index, row in enumerate(self.matrix):
+            y = count - row_index - 1
+            col = 0
+            # One rectangle per horizontal run of dark modules
+            while col < count:
+                if not row[col]:
+                    col += 1
+                    continue
+                start = col
+                while col < count and row[col]:
+                    col += 1
+                path.rect(start, y, col - start, 1)
+
+        # Draw in module units so the path is written with integer coordinates
+        self.canv.saveState()
+        self.canv.scale(self.size / count, self.size / count)
+        self.canv.setFillColorRGB(0, 0, 0)
+        self.canv.drawPath(path, stroke=0, fill=1)
+        self.canv.restoreState()
+
+@timed('generate_qr_code')
+def generate_qr_code(data, size=1.5*inch):
+    """Generate the verification QR code as an in-memory vector flowable.
+
+    The result goes straight into the PDF story; no PNG is encoded,
+    written or read back from disk.
+    """
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
         border=4,
+        # A fixed mask skips qrcode's trial of all eight masks, which is
+        # most of the encode time; any mask yields a valid code.
+        mask_pattern=2,
     )
-    qr.add_data(url)
+    qr.add_data(data)
     qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Ensure certificates directory exists
-    os.makedirs('certificates', exist_ok=True)
-    
-    qr_path = os.path.join('certificates', f'qr_{certificate_uuid}.png')
-    img.save(qr_path)
-    
-    return qr_path
\ No newline at end of file
+
+    return QRCodeFlowable(qr.get_matrix(), size=size)
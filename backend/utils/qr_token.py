@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+from utils.crypto import ISSUER_NAME
+import base64
+import uuid as uuid_lib
+
+# Compact, offline-verifiable certificate token carried in the QR code:
+#
+#   PSU1:<base45(CBOR [version, key_id, uuid, student_name, student_id,
+#                      degree, program, issue_date, signature])>
+#
+# The fields are exactly the signed certificate payload and the signature is
+# the one stored on the certificate, so checking a token needs only the
+# signer's public key. Base45 keeps the whole string inside the QR
+# alphanumeric charset, which packs 5.5 bits per character instead of 8.
+
+TOKEN_PREFIX = 'PSU1:'
+TOKEN_VERSION = 1
+
+_EPOCH = date(1970, 1, 1)
+
+class TokenError(ValueError):
+    """Raised for tokens that are malformed or of an unknown version"""
+
+def encode_token(certificate, student, key_id):
+    """Build the QR token for a signed certificate"""
+    fields = [
+        TOKEN_VERSION,
+        bytes.fromhex(key_id),
+        uuid_lib.UUID(certificate.uuid).bytes,
+        f"{student.first_name} {student.last_name}",
+        student.student_id,
+        certificate.degree,
+        certificate.program,
+        (certificate.issue_date - _EPOCH).days,
+        base64.b64decode(certificate.signature),
+    ]
+    return TOKEN_PREFIX + b45encode(cbor_encode(fields))
+
+def decode_token(token):
+    """Parse a QR token into (payload, signature_b64, key_id).
+
+    The payload has the same shape as build_certificate_payload, ready to
+    pass to verify_certificate. Raises TokenError if the token is malformed.
+    """
+    if not isinstance(token, str) or not token.startswith(TOKEN_PREFIX):
+        raise TokenError('Not a certificate token')
+    try:
+        fields = cbor_decode(b45decode(token[len(TOKEN_PREFIX):]))
+    except (ValueError, IndexError, RecursionError) as e:
+        raise TokenError(f'Malformed token: {e}')
+
+    if not isinstance(fields, list) or len(fields) != 9 or fields[0] != TOKEN_VERSION:
+        raise TokenError('Unsupported token version')
+    _, key_id, uuid_bytes, student_name, student_id, degree, program, days, signature = fields
+    if not (all(isinstance(f, bytes) for f in (key_id, uuid_bytes, signature))
+            and all(isinstance(f, str) for f in (student_name, student_id, degree, program))
+            and isinstance(days, int)):
+        raise TokenError('Malformed token fields')
+
+    try:
+        payload = {
+            'uuid': str(uuid_lib.UUID(bytes=uuid_bytes)),
+            'student_name': student_name,
+            'student_id': student_id,
+            'degree': degree,
+            'program': program,
+            'issue_date': (_EPOCH + timedelta(days=days)).isoformat(),
+            'issuer': ISSUER_NAME
+        }
+    except (TypeError, ValueError, OverflowError):
+        raise TokenError('Malformed token fields')
+    return payload, base64.b64encode(signature).decode('utf-8'), key_id.hex()
+
+# --------------------------------------------
+# Base45 (RFC 9285)
+# --------------------------------------------
+B45_CHARSET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:'
+_B45_VALUES = {c: i for i, c in enumerate(B45_CHARSET)}
+
+def b45encode(data):
+    out = []
+    for i in range(0, len(data) - 1, 2):
+        n = data[i] * 256 + data[i + 1]
+        n, c = divmod(n, 45)
+        e, d = divmod(n, 45)
+        out += (B45_CHARSET[c], B45_CHARSET[d], B45_CHARSET[e])
+    if len(data) % 2:
+        d, c = divmod(data[-1], 45)
+        out += (B45_CHARSET[c], B45_CHARSET[d])
+    return ''.join(out)
+
+def b45decode(text):
+    try:
+        values = [_B45_VALUES[c] for c in text]
+    except KeyError:
+        raise ValueError('invalid base45 character')
+    if len(values) % 3 == 1:
+        raise ValueError('invalid base45 length')
+
+    out = bytearray()
+    for i in range(0, len(values), 3):
+        chunk = values[i:i + 3]
+        n = sum(v * 45 ** j for j, v in enumerate(chunk))
+        if len(chunk) == 3:
+            if n > 0xFFFF:
+                raise ValueError('invalid base45 group')
+            out += n.to_bytes(2, 'big')
+        else:
+            if n > 0xFF:
+                raise ValueError('invalid base45 group')
+            out.append(n)
+    return bytes(out)
+
+# --------------------------------------------
+# CBOR (RFC 8949), the subset the token uses:
+# unsigned ints, byte strings, text strings and arrays
+# --------------------------------------------
+def _cbor_head(major, length):
+    if length < 24:
+        return bytes([major << 5 | length])
+    for info, size in ((24, 1), (25, 2), (26, 4), (27, 8)):
+        if length < 1 << (8 * size):
+            return bytes([major << 5 | info]) + length.to_bytes(size, 'big')
+    raise ValueError('value too large for CBOR')
+
+def cbor_encode(value):
+    if isinstance(value, bool) or value is None:
+        raise ValueError(f'unsupported CBOR type: {type(value).__name__}')
+    if isinstance(value, int):
+        if value < 0:
+            raise ValueError('negative integers are not supported')
+        return _cbor_head(0, value)
+    if isinstance(value, bytes):
+        return _cbor_head(2, len(value)) + value
+    if isinstance(value, str):
+        encoded = value.encode('utf-8')
+        return _cbor_head(3, len(encoded)) + encoded
+    if isinstance(value, list):
+        return _cbor_head(4, len(value)) + b''.join(cbor_encode(item) for item in value)
+    raise ValueError(f'unsupported CBOR type: {type(value).__name__}')
+
+# The token is one flat array; anything nested deeper is rejected before
+# it can recurse far
+MAX_CBOR_DEPTH = 1
+
+def cbor_decode(data):
+    value, offset = _cbor_decode_at(data, 0, 0)
+    if offset != len(data):
+        raise ValueError('trailing bytes after CBOR value')
+    return value
+
+def _cbor_decode_at(data, offset, depth):
+    initial = data[offset]
+    major, info = initial >> 5, initial & 0x1F
+    offset += 1
+    if info < 24:
+        length = info
+    elif info <= 27:
+        size = 1 << (info - 24)
+        if offset + size > len(data):
+            raise ValueError('truncated CBOR')
+        length = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+    else:
+        raise ValueError('indefinite-length CBOR is not supported')
+
+    if major == 0:
+        return length, offset
+    if major in (2, 3):
+        end = offset + length
+        if end > len(data):
+            raise ValueError('truncated CBOR')
+        chunk = bytes(data[offset:end])
+        return (chunk if major == 2 else chunk.decode('utf-8')), end
+    if major == 4:
+        if depth >= MAX_CBOR_DEPTH:
+            raise ValueError('CBOR nested too deeply')
+        if length > len(data) - offset:
+            raise ValueError('truncated CBOR')
+        items = []
+        for _ in range(length):
+            item, offset = _cbor_decode_at(data, offset, depth + 1)
+            items.append(item)
+        return items, offset
+    raise ValueError(f'unsupported CBOR major type {major}')
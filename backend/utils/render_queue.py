@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, update
+from models import db, Certificate, Student
+import os
+import time
+
+# 'queue' leaves rendering to render_worker.py processes; 'inline' renders
+# during the issuance request for single-process deployments.
+RENDER_MODE = os.getenv('RENDER_MODE', 'queue')
+MAX_ATTEMPTS = int(os.getenv('RENDER_MAX_ATTEMPTS', 3))
+# A failed job waits RETRY_BACKOFF * 2^(attempts - 1) seconds before its next try
+RETRY_BACKOFF = int(os.getenv('RENDER_RETRY_BACKOFF_SECONDS', 30))
+STALE_AFTER = timedelta(seconds=int(os.getenv('RENDER_STALE_SECONDS', 300)))
+RETRY_AFTER_SECONDS = int(os.getenv('RENDER_RETRY_AFTER', 5))
+
+PENDING_STATUSES = ('pending', 'rendering')
+
+def render_inline_enabled():
+    return RENDER_MODE == 'inline'
+
+def render_certificate(certificate, student):
+    """Render the QR code and PDF for a certificate and mark it done"""
+    from utils.issuance import render_certificate_files
+
+    # pdf_path records the storage object key of the rendered PDF
+    certificate.pdf_path = render_certificate_files(certificate, student)
+    certificate.render_status = 'done'
+    certificate.render_error = None
+
+def _claimable(now):
+    # Pending jobs due for a (re)try, plus jobs whose worker died mid-render
+    return or_(
+        and_(Certificate.render_status == 'pending',
+             or_(Certificate.render_retry_at.is_(None), Certificate.render_retry_at <= now)),
+        and_(Certificate.render_status == 'rendering',
+             Certificate.render_started_at < now - STALE_AFTER)
+    )
+
+def claim_next_job():
+    """Claim one render job and return its certificate id, or None if idle.
+
+    The claim is a conditional UPDATE, so any number of workers on any
+    number of nodes can poll the same table without double-rendering.
+    """
+    now = datetime.utcnow()
+    candidates = db.session.query(Certificate.id) \
+        .filter(_claimable(now)) \
+        .order_by(Certificate.id) \
+        .limit(10) \
+        .all()
+
+    for (cert_id,) in candidates:
+        result = db.session.execute(
+            update(Certificate)
+            .where(Certificate.id == cert_id, _claimable(now))
+            .values(render_status='rendering', render_started_at=now,
+                    render_attempts=Certificate.render_attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return cert_id
+    return None
+
+def process_job(cert_id):
+    """Render a claimed certificate, recording success or failure"""
+    certificate, student = db.session.query(Certificate, Student) \
+        .join(Student, Certificate.student_id == Student.id) \
+        .filter(Certificate.id == cert_id) \
+        .one()
+    # Reclaimed after its worker died on every attempt (e.g. killed for memory)
+    if certificate.render_attempts > MAX_ATTEMPTS:
+        certificate.render_status = 'failed'
+        certificate.render_error = certificate.render_error or 'Render worker stopped mid-render'
+        db.session.commit()
+        return certificate.render_status
+    try:
+        render_certificate(certificate, student)
+        certificate.render_retry_at = None
+    except Exception as e:
+        certificate.render_error = str(e)
+        if certificate.render_attempts >= MAX_ATTEMPTS:
+            certificate.render_status = 'failed'
+        else:
+            certificate.render_status = 'pending'
+            certificate.render_retry_at = datetime.utcnow() + timedelta(
+                seconds=RETRY_BACKOFF * 2 ** (certificate.render_attempts - 1))
+    db.session.commit()
+    return certificate.render_status
+
+def run_worker(poll_interval=1.0, should_stop=lambda: False):
+    """Process render jobs until should_stop() returns True"""
+    while not should_stop():
+        cert_id = claim_next_job()
+        if cert_id is None:
+            db.session.remove()
+            time.sleep(poll_interval)
+            continue
+        status = process_job(cert_id)
+        print(f"Rendered certificate {cert_id}: {status}")
@@ -0,0 +1,221 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from models import db, RevocationEvent
+from utils.crypto import sign_payload
+import base64
+import hashlib
+import math
+import threading
+import time
+import uuid as uuid_lib
+import os
+
+class RevocationList:
+    """Per-process, versioned set of revoked certificate UUIDs.
+
+    Built from the append-only revocation_events log: an event's id is the
+    list version at which that certificate became revoked. The first use
+    loads the whole log; after that, refreshes (at most once per ttl
+    seconds, or on demand after a revocation) only fetch events newer than
+    the last one loaded. UUIDs are kept as 16-byte values, so a million
+    revocations stay in the tens of megabytes.
+
+    Ids are allocated when an event is inserted but become visible when its
+    transaction commits, so a lower id can appear after a higher one. Ids
+    missing below the highest one seen are tracked as gaps and re-scanned
+    on every refresh until they show up or gap_timeout seconds pass after
+    the event above them was written (a rolled-back insert never shows up).
+    is_revoked() sees every event as soon as it is loaded, but the published
+    version stops below the oldest open gap, so a version's documents never
+    change and a client's `since` never skips a late event.
+
+    Published documents (full list, deltas, bloom filter) are signed with
+    the active key over their canonical JSON minus the signature fields,
+    and the full list and bloom filter are built once per version. Needs
+    an app context to refresh.
+    """
+
+    def __init__(self, ttl=60, bloom_fp_rate=0.001, gap_timeout=60):
+        self.ttl = ttl
+        self.bloom_fp_rate = bloom_fp_rate
+        self.gap_timeout = gap_timeout
+        self._lock = threading.Lock()
+        self._revoked = set()
+        self._versions = []
+        self._uuids = []
+        # Highest event id loaded, and missing ids below it -> give-up time
+        self._scanned = 0
+        self._gaps = {}
+        self.version = 0
+        self._loaded_at = None
+        self._documents = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ttl=float(os.getenv('REVOCATION_LIST_TTL', 60)),
+            bloom_fp_rate=float(os.getenv('REVOCATION_BLOOM_FP_RATE', 0.001)),
+            gap_timeout=float(os.getenv('REVOCATION_GAP_TIMEOUT', 60))
+        )
+
+    def is_revoked(self, uuid):
+        self._refresh_if_stale()
+        return self.contains(uuid)
+
+    def contains(self, uuid):
+        """is_revoked() without the refresh, for callers that load events themselves"""
+        try:
+            return uuid_lib.UUID(uuid).bytes in self._revoked
+        except ValueError:
+            return False
+
+    def is_stale(self):
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at > self.ttl
+
+    def events_query(self):
+        """SELECT of the events the next refresh needs, for apply_events()"""
+        # Re-scan from the oldest open gap; rows at or below it are known
+        start = min(self._gaps) - 1 if self._gaps else self._scanned
+        return select(RevocationEvent.id, RevocationEvent.certificate_uuid, RevocationEvent.revoked_at) \
+            .where(RevocationEvent.id > start) \
+            .order_by(RevocationEvent.id)
+
+    def apply_events(self, events):
+        """Apply (id, certificate_uuid, revoked_at) rows from events_query()"""
+        with self._lock:
+            self._apply_events(events)
+
+    def refresh(self, max_age=None):
+        """Apply revocation events not seen yet and advance the published version.
+
+        With max_age, do nothing if the list was refreshed within max_age
+        seconds (checked under the lock, so callers queued behind a refresh
+        don't each run the query).
+        """
+        with self._lock:
+            if max_age is not None and self._loaded_at is not None \
+                    and time.monotonic() - self._loaded_at <= max_age:
+                return
+            self._apply_events(db.session.execute(self.events_query()).all())
+
+    def _apply_events(self, events):
+        now = datetime.utcnow()
+        for event_id, uuid, revoked_at in events:
+            if event_id <= self._scanned:
+                if self._gaps.pop(event_id, None) is not None:
+                    self._apply(event_id, uuid)
+                continue
+            deadline = (revoked_at or now) + timedelta(seconds=self.gap_timeout)
+            if deadline > now:
+                for missing in range(self._scanned + 1, event_id):
+                    self._gaps[missing] = deadline
+            self._scanned = event_id
+            self._apply(event_id, uuid)
+        self._gaps = {gap: deadline for gap, deadline in self._gaps.items() if deadline > now}
+
+        version = min(self._gaps) - 1 if self._gaps else self._scanned
+        if version != self.version:
+            self.version = version
+            self._documents.clear()
+        self._loaded_at = time.monotonic()
+
+    def _apply(self, version, uuid):
+        value = uuid_lib.UUID(uuid).bytes
+        if value in self._revoked:
+            return
+        self._revoked.add(value)
+        # Late events arrive out of order; keep the version index sorted
+        index = bisect_right(self._versions, version)
+        self._versions.insert(index, version)
+        self._uuids.insert(index, value)
+
+    def current(self):
+        """Refresh if stale and return the current version"""
+        self._refresh_if_stale()
+        return self.version
+
+    def full_document(self):
+        """Signed full list for the current version"""
+        version = self.current()
+        return self._cached(('full', version), lambda: self._sign({
+            'version': version,
+            'revoked': sorted(str(uuid_lib.UUID(bytes=u)) for u in self._uuids[:self._index(version)])
+        }))
+
+    def delta_document(self, since):
+        """Signed list of UUIDs revoked after version `since`"""
+        version = self.current()
+        start, end = bisect_right(self._versions, since), self._index(version)
+        return self._cached(('delta', since, version), lambda: self._sign({
+            'since': since,
+            'version': version,
+            'added': [str(uuid_lib.UUID(bytes=u)) for u in self._uuids[start:end]]
+        }))
+
+    def bloom_document(self):
+        """Signed bloom filter over the revoked UUIDs for the current version.
+
+        A UUID is possibly revoked iff all `hashes` bits are set, where bit i
+        is (h1 + i * h2) mod bits and h1, h2 are the first two big-endian
+        64-bit words of sha256(uuid string).
+        """
+        version = self.current()
+
+        def build():
+            uuids = [str(uuid_lib.UUID(bytes=u)) for u in self._uuids[:self._index(version)]]
+            bits, hashes = bloom_parameters(len(uuids), self.bloom_fp_rate)
+            return self._sign({
+                'version': version,
+                'count': len(uuids),
+                'bits': bits,
+                'hashes': hashes,
+                'filter': base64.b64encode(build_bloom_filter(uuids, bits, hashes)).decode('ascii')
+            })
+        return self._cached(('bloom', version), build)
+
+    def _index(self, version):
+        return bisect_right(self._versions, version)
+
+    def _cached(self, key, build):
+        document = self._documents.get(key)
+        if document is None:
+            document = build()
+            # Deltas are keyed by the client's `since`; keep the cache bounded
+            if len(self._documents) > 256:
+                self._documents.clear()
+            self._documents[key] = document
+        return document
+
+    @staticmethod
+    def _sign(payload):
+        return dict(payload, **sign_payload(payload))
+
+    def _refresh_if_stale(self):
+        if self.is_stale():
+            self.refresh(max_age=self.ttl)
+
+def bloom_parameters(count, fp_rate):
+    """(bits, hashes) for a bloom filter holding `count` items at `fp_rate`"""
+    count = max(count, 1)
+    bits = max(64, math.ceil(-count * math.log(fp_rate) / (math.log(2) ** 2)))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(-math.log(fp_rate) / math.log(2)))
+    return bits, hashes
+
+def bloom_positions(uuid, bits, hashes):
+    digest = hashlib.sha256(uuid.encode('utf-8')).digest()
+    h1 = int.from_bytes(digest[:8], 'big')
+    h2 = int.from_bytes(digest[8:16], 'big')
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+def build_bloom_filter(uuids, bits, hashes):
+    """Bloom filter bitset (bit n is byte n // 8, mask 0x80 >> n % 8)"""
+    bitset = bytearray(bits // 8)
+    for uuid in uuids:
+        for position in bloom_positions(uuid, bits, hashes):
+            bitset[position // 8] |= 0x80 >> (position % 8)
+    return bytes(bitset)
+
+revocation_list = RevocationList.from_env()
@@ -0,0 +1,169 @@
+from flask import Response, redirect, request, send_file
+import hashlib
+import threading
+import os
+
+class LocalStorage:
+    """Filesystem object store with hashed two-level shard directories.
+
+    An object key maps to <root>/ab/cd/<key>, where abcd is the start of
+    sha256(key), so no single directory grows past a few hundred entries
+    even with millions of objects.
+    """
+
+    def __init__(self, root='certificates'):
+        self.root = root
+
+    def local_path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], key)
+
+    def exists(self, key):
+        return os.path.exists(self.local_path(key))
+
+    def put(self, key, data, content_type='application/octet-stream'):
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    def touch(self, key):
+        try:
+            os.utime(self.local_path(key))
+        except OSError:
+            pass
+
+    def iter_objects(self):
+        """Yield (key, size, mtime) for every stored object"""
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.tmp'):
+                    continue
+                st = os.stat(os.path.join(dirpath, name))
+                yield name, st.st_size, st.st_mtime
+
+    def presigned_url(self, key, download_name=None, expires_in=300):
+        return None
+
+class S3Storage:
+    """Object store on any S3-compatible service (AWS S3, MinIO, Ceph, R2).
+
+    Point endpoint_url at a local MinIO (see docker-compose's s3 profile)
+    to run against a stand-in. Requires boto3.
+    """
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region_name=None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region_name)
+
+    def _key(self, key):
+        return f'{self.prefix}{key}'
+
+    def local_path(self, key):
+        return None
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def put(self, key, data, content_type='application/octet-stream'):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data, ContentType=content_type)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def touch(self, key):
+        # Recency on S3 is left to bucket lifecycle rules
+        pass
+
+    def iter_objects(self):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get('Contents', []):
+                yield obj['Key'][len(self.prefix):], obj['Size'], obj['LastModified'].timestamp()
+
+    def get_object(self, key, byte_range=None):
+        params = {'Bucket': self.bucket, 'Key': self._key(key)}
+        if byte_range:
+            params['Range'] = byte_range
+        return self.client.get_object(**params)
+
+    def presigned_url(self, key, download_name=None, expires_in=300):
+        params = {'Bucket': self.bucket, 'Key': self._key(key)}
+        if download_name:
+            params['ResponseContentDisposition'] = f'attachment; filename="{download_name}"'
+        return self.client.generate_presigned_url('get_object', Params=params, ExpiresIn=expires_in)
+
+def storage_from_env():
+    """Build the storage backend selected by STORAGE_BACKEND (local or s3)"""
+    backend = os.getenv('STORAGE_BACKEND', 'local')
+    if backend == 'local':
+        return LocalStorage(root=os.getenv('STORAGE_ROOT', 'certificates'))
+    if backend == 's3':
+        return S3Storage(
+            bucket=os.environ['S3_BUCKET'],
+            prefix=os.getenv('S3_PREFIX', 'certificates/'),
+            endpoint_url=os.getenv('S3_ENDPOINT_URL') or None,
+            region_name=os.getenv('S3_REGION') or None
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+storage = storage_from_env()
+
+REDIRECT_DOWNLOADS = os.getenv('STORAGE_REDIRECT_DOWNLOADS', 'true').lower() == 'true'
+PRESIGNED_URL_TTL = int(os.getenv('STORAGE_PRESIGNED_URL_TTL', 300))
+
+def send_stored_file(key, mimetype, download_name, etag=None):
+    """Serve a stored object: pre-signed redirect, local file or proxied stream.
+
+    Local files and proxied S3 streams both honour Range requests.
+    """
+    if REDIRECT_DOWNLOADS:
+        url = storage.presigned_url(key, download_name=download_name, expires_in=PRESIGNED_URL_TTL)
+        if url:
+            response = redirect(url, code=302)
+            if etag:
+                response.set_etag(etag)
+            return response
+
+    path = storage.local_path(key)
+    if path is not None:
+        return send_file(os.path.abspath(path), mimetype=mimetype, as_attachment=True,
+                         download_name=download_name, etag=etag, conditional=True)
+
+    range_header = request.headers.get('Range')
+    obj = storage.get_object(key, byte_range=range_header)
+    response = Response(obj['Body'].iter_chunks(), mimetype=mimetype,
+                        status=206 if obj.get('ContentRange') else 200)
+    response.headers['Content-Length'] = str(obj['ContentLength'])
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.headers['Content-Disposition'] = f'attachment; filename={download_name}'
+    if obj.get('ContentRange'):
+        response.headers['Content-Range'] = obj['ContentRange']
+    if etag:
+        response.set_etag(etag)
+    return response
@@ -0,0 +1,61 @@
+from utils.crypto import ISSUER_NAME, build_certificate_payload, verify_certificate
+import hashlib
+
+# Bump when the verdict body format changes, so cached verdicts revalidate
+VERDICT_VERSION = 1
+
+def verdict_etag(certificate):
+    """Strong ETag for a certificate's verdict: its signature plus revocation state.
+
+    The signature covers every certificate field in the verdict body, so
+    the ETag only changes on re-signing or revocation.
+    """
+    parts = (str(VERDICT_VERSION), certificate.signature or '', certificate.key_id or '',
+             str(bool(certificate.revoked)), certificate.revoked_reason or '')
+    return 'v-' + hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+def certificate_verdict(row):
+    """Return the (body, status_code, etag) verdict for a loaded (certificate, student) row.
+
+    Shared by the Flask routes and the async verify service. Only reads
+    already-loaded attributes, so it is safe to call from worker threads.
+    NOT_FOUND and INVALID verdicts carry no ETag and are never cached by clients.
+    """
+    if not row:
+        return {
+            'status': 'NOT_FOUND',
+            'message': 'Certificate not found'
+        }, 404, None
+    
+    certificate, student = row
+    
+    if certificate.revoked:
+        return {
+            'status': 'REVOKED',
+            'message': 'Certificate has been revoked',
+            'reason': certificate.revoked_reason
+        }, 200, verdict_etag(certificate)
+    
+    payload = build_certificate_payload(certificate, student)
+    
+    is_valid = verify_certificate(payload, certificate.signature, certificate.key_id,
+                                  certificate.signature_algorithm, certificate.merkle_proof)
+    
+    if is_valid:
+        return {
+            'status': 'VALID',
+            'message': 'Certificate is valid',
+            'certificate': {
+                'student_name': payload['student_name'],
+                'student_id': student.student_id,
+                'degree': certificate.degree,
+                'program': certificate.program,
+                'issue_date': payload['issue_date'],
+                'issuer': ISSUER_NAME
+            }
+        }, 200, verdict_etag(certificate)
+    else:
+        return {
+            'status': 'INVALID',
+            'message': 'Certificate signature is invalid'
+        }, 400, None
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Async verification service for high-concurrency public QR scans.
+
+A minimal ASGI app serving the two public read endpoints,
+GET /api/certificates/<uuid>/verify and GET /api/certificates/<uuid>/download,
+with the same responses as the Flask API. Database reads go through
+SQLAlchemy's async engine on the `models` tables, so an in-flight request
+costs a coroutine rather than a worker thread. Signature checks and PDF
+rendering run in a thread pool.
+
+Route the public paths here and everything else to the Flask app:
+
+    pip install uvicorn asyncpg        # aiosqlite instead of asyncpg for SQLite
+    uvicorn verify_service:app --host 0.0.0.0 --port 8001 --workers 4
+
+Verdicts are cached per process like in the Flask workers, and cached
+VALID verdicts are checked against a per-process revocation list, so a
+revocation shows up here within REVOCATION_LIST_TTL. Cache-Control and
+ETag headers follow the Flask routes (see utils/http_cache.py).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from dotenv import load_dotenv
+import asyncio
+import json
+import os
+import re
+
+load_dotenv()
+
+from sqlalchemy import select
+from models import Certificate, Issuer, Student
+from utils.cache import VerificationCache
+from utils.crypto import key_manager
+from utils.db_pool import normalize_database_url
+from utils.http_cache import (
+    DOWNLOAD_MAX_AGE, DOWNLOAD_STALE_WHILE_REVALIDATE, VERIFY_MAX_AGE,
+    VERIFY_STALE_WHILE_REVALIDATE, download_etag, public_cache_control
+)
+from utils.revocation import RevocationList
+from utils.verification import certificate_verdict
+
+CERTIFICATE_COLUMNS = (
+    Certificate.uuid, Certificate.degree, Certificate.program, Certificate.issue_date,
+    Certificate.signature, Certificate.key_id, Certificate.signature_algorithm,
+    Certificate.merkle_proof, Certificate.revoked, Certificate.revoked_reason,
+    Certificate.render_status
+)
+STUDENT_COLUMNS = (Student.first_name, Student.last_name, Student.student_id)
+
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+ROUTE = re.compile(r'^/api/certificates/([^/]+)/(verify|download)$')
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', b'Content-Type,Authorization,X-Requested-With'),
+]
+
+NO_STORE = (b'cache-control', b'no-cache, no-store, must-revalidate')
+
+def cache_header(max_age, stale_while_revalidate=0):
+    return (b'cache-control', public_cache_control(max_age, stale_while_revalidate).encode('ascii'))
+
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+
+def async_database_url(url):
+    """Swap a sync DATABASE_URL's driver for its asyncio counterpart"""
+    url = normalize_database_url(url)
+    scheme, sep, rest = url.partition('://')
+    # Flask-SQLAlchemy resolves relative SQLite paths against the instance folder
+    if scheme == 'sqlite' and rest.startswith('/') and not rest.startswith('//') and rest != '/:memory:':
+        rest = '/' + os.path.join(INSTANCE_PATH, rest[1:])
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+class VerifyService:
+    """ASGI application; one instance per process"""
+
+    def __init__(self):
+        self.engine = None
+        self.cache = VerificationCache.from_env()
+        self.revocations = RevocationList.from_env()
+        self.revocations_lock = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('VERIFY_SERVICE_THREADS', os.cpu_count() or 1)),
+            thread_name_prefix='verify'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.handle(scope, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.startup()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def startup(self):
+        try:
+            from sqlalchemy.ext.asyncio import create_async_engine
+        except ImportError:
+            raise RuntimeError("verify_service requires SQLAlchemy's asyncio extra (pip install greenlet)")
+
+        url = async_database_url(os.getenv('DATABASE_URL', 'sqlite:///psu_certificates.db'))
+        options = {}
+        if url.startswith('postgresql'):
+            options = {
+                'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+                'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+                'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 300)),
+                'pool_pre_ping': True
+            }
+        self.engine = create_async_engine(url, **options)
+        self.revocations_lock = asyncio.Lock()
+
+        # Parse the active key now instead of on the first request
+        try:
+            key_manager.public_key()
+        except FileNotFoundError as e:
+            print(f"Public key not preloaded: {e}")
+
+    async def handle(self, scope, send):
+        match = ROUTE.match(scope['path'])
+        if scope['method'] == 'OPTIONS':
+            await self.respond(send, 200, b'')
+        elif scope['path'] in ('/health', '/'):
+            await self.respond_json(send, 200, {'status': 'ok'})
+        elif match is None or scope['method'] != 'GET':
+            await self.respond_json(send, 404, {'error': 'Not found'})
+        elif match.group(2) == 'verify':
+            await self.verify(scope, send, match.group(1))
+        else:
+            await self.download(scope, send, match.group(1))
+
+    # ----------------------------------------
+    # GET /api/certificates/<uuid>/verify
+    # ----------------------------------------
+    async def verify(self, scope, send, uuid):
+        verdict = self.cache.get(uuid)
+        # Same check as the Flask routes: another process may have revoked it
+        if verdict is not None and verdict[0]['status'] == 'VALID' and await self.is_revoked(uuid):
+            self.cache.invalidate(uuid)
+            verdict = None
+        if verdict is None:
+            generation = self.cache.generation(uuid)
+            row = await self.load_row(uuid)
+            if row is not None:
+                await self.ensure_key(row[0].key_id)
+            loop = asyncio.get_running_loop()
+            verdict = await loop.run_in_executor(self.executor, certificate_verdict, row)
+            self.cache.set(uuid, verdict, generation)
+
+        body, status_code, etag = verdict
+        if etag is None:
+            await self.respond_json(send, status_code, body)
+            return
+        headers = [(b'etag', f'"{etag}"'.encode('ascii')),
+                   cache_header(VERIFY_MAX_AGE, VERIFY_STALE_WHILE_REVALIDATE)]
+        if f'"{etag}"' in self.header(scope, b'if-none-match'):
+            await self.respond(send, 304, b'', headers)
+        else:
+            await self.respond_json(send, status_code, body, headers)
+
+    # ----------------------------------------
+    # GET /api/certificates/<uuid>/download
+    # ----------------------------------------
+    async def download(self, scope, send, uuid):
+        from utils.issuance import certificate_pdf_key, render_certificate_files
+        from utils.pdf_cache import PdfCache, pdf_cache
+        from utils.render_queue import PENDING_STATUSES, RETRY_AFTER_SECONDS
+        from utils.storage import PRESIGNED_URL_TTL, REDIRECT_DOWNLOADS, storage
+
+        row = await self.load_row(uuid)
+        if row is None:
+            await self.respond_json(send, 404, {'error': 'Certificate or PDF not found'})
+            return
+        certificate, student = row
+
+        loop = asyncio.get_running_loop()
+        etag = certificate_pdf_key(certificate, student)
+        validator = download_etag(etag, certificate.revoked)
+        etag_header = [(b'etag', f'"{validator}"'.encode('ascii'))]
+        # Revoked certificates' PDFs fall back to no-store in respond()
+        cached = etag_header if certificate.revoked else \
+            etag_header + [cache_header(DOWNLOAD_MAX_AGE, DOWNLOAD_STALE_WHILE_REVALIDATE)]
+        if f'"{validator}"' in self.header(scope, b'if-none-match'):
+            await self.respond(send, 304, b'', cached)
+            return
+
+        if not await loop.run_in_executor(self.executor, pdf_cache.contains, etag):
+            if certificate.render_status in PENDING_STATUSES:
+                await self.respond_json(send, 202, {
+                    'status': certificate.render_status.upper(),
+                    'message': 'Certificate PDF is still being generated',
+                    'retry_after': RETRY_AFTER_SECONDS
+                }, [(b'retry-after', str(RETRY_AFTER_SECONDS).encode('ascii'))])
+                return
+            try:
+                await loop.run_in_executor(self.executor, render_certificate_files, certificate, student)
+            except Exception as e:
+                print(f"PDF render error: {e}")
+                await self.respond_json(send, 500, {'error': 'Certificate PDF could not be generated'})
+                return
+
+        key = PdfCache.object_key(etag)
+        download_name = f'certificate_{uuid}.pdf'
+        if REDIRECT_DOWNLOADS:
+            url = await loop.run_in_executor(
+                self.executor, lambda: storage.presigned_url(key, download_name=download_name,
+                                                             expires_in=PRESIGNED_URL_TTL))
+            if url:
+                headers = etag_header + [(b'location', url.encode('utf-8'))]
+                if not certificate.revoked:
+                    headers.append(cache_header(min(DOWNLOAD_MAX_AGE, PRESIGNED_URL_TTL // 2)))
+                await self.respond(send, 302, b'', headers)
+                return
+
+        try:
+            data = await loop.run_in_executor(self.executor, self.read_object, storage, key)
+        except FileNotFoundError:
+            # Evicted by another process's cache sweep since the check above
+            try:
+                await loop.run_in_executor(self.executor, render_certificate_files, certificate, student)
+                data = await loop.run_in_executor(self.executor, self.read_object, storage, key)
+            except Exception as e:
+                print(f"PDF render error: {e}")
+                await self.respond_json(send, 500, {'error': 'Certificate PDF could not be generated'})
+                return
+        await self.respond(send, 200, data, cached + [
+            (b'content-type', b'application/pdf'),
+            (b'content-disposition', f'attachment; filename={download_name}'.encode('utf-8'))
+        ])
+
+    @staticmethod
+    def read_object(storage, key):
+        path = storage.local_path(key)
+        if path is not None:
+            with open(path, 'rb') as f:
+                return f.read()
+        return storage.get_object(key)['Body'].read()
+
+    # ----------------------------------------
+    # Database
+    # ----------------------------------------
+    async def load_row(self, uuid):
+        """(certificate, student) namespaces for a UUID, or None"""
+        query = select(*CERTIFICATE_COLUMNS, *STUDENT_COLUMNS) \
+            .join(Student, Certificate.student_id == Student.id) \
+            .where(Certificate.uuid == uuid)
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(query)).mappings().first()
+        if row is None:
+            return None
+        certificate = SimpleNamespace(**{c.key: row[c.key] for c in CERTIFICATE_COLUMNS})
+        student = SimpleNamespace(**{c.key: row[c.key] for c in STUDENT_COLUMNS})
+        return certificate, student
+
+    async def is_revoked(self, uuid):
+        """Check the revocation list, loading new events every REVOCATION_LIST_TTL seconds"""
+        if self.revocations.is_stale():
+            async with self.revocations_lock:
+                # Coroutines that queued behind a refresh skip theirs
+                if self.revocations.is_stale():
+                    async with self.engine.connect() as conn:
+                        events = (await conn.execute(self.revocations.events_query())).all()
+                    self.revocations.apply_events(events)
+        return self.revocations.contains(uuid)
+
+    async def ensure_key(self, key_id):
+        """Load a rotated-out public key from the registry before verifying with it"""
+        if key_id is None:
+            return
+        try:
+            key_manager.public_key_for(key_id)
+            return
+        except (KeyError, FileNotFoundError):
+            pass
+        async with self.engine.connect() as conn:
+            pem = (await conn.execute(
+                select(Issuer.public_key_pem).where(Issuer.key_id == key_id)
+            )).scalar()
+        if pem:
+            key_manager.add_public_key(pem.encode('utf-8'))
+
+    # ----------------------------------------
+    # HTTP helpers
+    # ----------------------------------------
+    @staticmethod
+    def header(scope, name):
+        for key, value in scope['headers']:
+            if key == name:
+                return value.decode('latin-1')
+        return ''
+
+    async def respond_json(self, send, status, body, headers=()):
+        await self.respond(send, status, json.dumps(body).encode('utf-8'),
+                           [(b'content-type', b'application/json')] + list(headers))
+
+    @staticmethod
+    async def respond(send, status, body, headers=()):
+        headers = list(headers)
+        if not any(key == b'cache-control' for key, _ in headers):
+            headers.append(NO_STORE)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': CORS_HEADERS + headers + [
+                (b'content-length', str(len(body)).encode('ascii'))
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+app = VerifyService()
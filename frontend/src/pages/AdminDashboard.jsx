@@ -18,16 +18,18 @@ const AdminDashboard = () => {
 
   const fetchDashboardData = async () => {
     try {
-      const response = await api.get('/certificates') // ✅ fixed
-      const certificates = response.data
+      const [statsResponse, recentResponse] = await Promise.all([
+        api.get('/certificates/stats'),
+        api.get('/certificates', { params: { limit: 5 } })
+      ])
 
       setStats({
-        totalCertificates: certificates.length,
-        validCertificates: certificates.filter(cert => !cert.revoked).length,
-        revokedCertificates: certificates.filter(cert => cert.revoked).length
+        totalCertificates: statsResponse.data.total,
+        validCertificates: statsResponse.data.valid,
+        revokedCertificates: statsResponse.data.revoked
       })
 
-      setRecentCertificates(certificates.slice(0, 5))
+      setRecentCertificates(recentResponse.data.certificates)
     } catch (error) {
       console.error('Failed to fetch dashboard data:', error)
     }
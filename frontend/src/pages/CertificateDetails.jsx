@@ -40,6 +40,11 @@ const CertificateDetails = () => {
       const response = await api.get(`/api/certificates/${id}/download`, {
         responseType: 'blob'
       })
+
+      if (response.status === 202) {
+        toast('Certificate PDF is still being generated. Please try again in a few seconds.')
+        return
+      }
       
       const url = window.URL.createObjectURL(new Blob([response.data]))
       const link = document.createElement('a')
@@ -2,32 +2,60 @@ import { useState, useEffect } from 'react'
 import { Link } from 'react-router-dom'
 import Navbar from '../components/Navbar'
 import api from '../utils/api'
+import toast from 'react-hot-toast'
 import { Eye, Download, Ban, Plus } from 'lucide-react'
 
+const PAGE_SIZE = 50
+
 const CertificateList = () => {
   const [certificates, setCertificates] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [filters, setFilters] = useState({ student_id: '', revoked: '' })
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     fetchCertificates()
-  }, [])
+  }, [filters])
+
+  const fetchCertificates = async (cursor = null) => {
+    const params = { limit: PAGE_SIZE }
+    if (cursor) params.cursor = cursor
+    if (filters.student_id) params.student_id = filters.student_id
+    if (filters.revoked) params.revoked = filters.revoked
 
-  const fetchCertificates = async () => {
     try {
-      const response = await api.get('/api/certificates')
-      setCertificates(response.data)
+      const response = await api.get('/certificates', { params })
+      const page = response.data.certificates
+      setCertificates(cursor ? (prev) => [...prev, ...page] : page)
+      setNextCursor(response.data.next_cursor)
     } catch (error) {
       console.error('Failed to fetch certificates:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
+  const handleLoadMore = () => {
+    setLoadingMore(true)
+    fetchCertificates(nextCursor)
+  }
+
+  const handleFilterChange = (e) => {
+    setFilters({ ...filters, [e.target.name]: e.target.value })
+  }
+
   const handleDownload = async (uuid) => {
     try {
       const response = await api.get(`/api/certificates/${uuid}/download`, {
         responseType: 'blob'
       })
+
+      if (response.status === 202) {
+        toast('Certificate PDF is still being generated. Please try again in a few seconds.')
+        return
+      }
       
       const url = window.URL.createObjectURL(new Blob([response.data]))
       const link = document.createElement('a')
@@ -71,6 +99,27 @@ const CertificateList = () => {
             </Link>
           </div>
 
+          <div className="flex space-x-4 mb-4">
+            <input
+              type="text"
+              name="student_id"
+              value={filters.student_id}
+              onChange={handleFilterChange}
+              placeholder="Filter by Student ID"
+              className="px-3 py-2 border border-gray-300 rounded-md shadow-sm text-sm focus:outline-none focus:ring-primary-500 focus:border-primary-500"
+            />
+            <select
+              name="revoked"
+              value={filters.revoked}
+              onChange={handleFilterChange}
+              className="px-3 py-2 border border-gray-300 rounded-md shadow-sm text-sm focus:outline-none focus:ring-primary-500 focus:border-primary-500"
+            >
+              <option value="">All statuses</option>
+              <option value="false">Valid</option>
+              <option value="true">Revoked</option>
+            </select>
+          </div>
+
           <div className="bg-white shadow rounded-lg overflow-hidden">
             {certificates.length > 0 ? (
               <table className="min-w-full divide-y divide-gray-200">
@@ -154,6 +203,10 @@ const CertificateList = () => {
                   ))}
                 </tbody>
               </table>
+            ) : filters.student_id || filters.revoked ? (
+              <div className="text-center py-12">
+                <p className="text-gray-500 text-lg">No certificates match these filters.</p>
+              </div>
             ) : (
               <div className="text-center py-12">
                 <p className="text-gray-500 text-lg">No certificates issued yet.</p>
@@ -167,6 +220,18 @@ const CertificateList = () => {
               </div>
             )}
           </div>
+
+          {nextCursor && (
+            <div className="flex justify-center mt-6">
+              <button
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+                className="inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </div>